@@ -105,9 +105,10 @@ def compare_scalar_paths(pathbeginner, pathexpert, bodyparts, scalar_type="AMAC"
         else:
             print(f"Column {col_name} not found in both files.")
 
-compare_scalar_paths(
-    pathbeginner="/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/scaled_Data/processed_AngMomData/N1/roundhouse/scaled/AMOCscalar/averaged.csv",
-    pathexpert="/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/scaled_Data/processed_AngMomData/E3/roundhouse/scaled/AMOCscalar/averaged.csv",
-    bodyparts=bodyparts,
-    scalar_type="AMOC"
-)
\ No newline at end of file
+if __name__ == "__main__":
+    compare_scalar_paths(
+        pathbeginner="/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/scaled_Data/processed_AngMomData/N1/roundhouse/scaled/AMOCscalar/averaged.csv",
+        pathexpert="/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/scaled_Data/processed_AngMomData/E3/roundhouse/scaled/AMOCscalar/averaged.csv",
+        bodyparts=bodyparts,
+        scalar_type="AMOC"
+    )
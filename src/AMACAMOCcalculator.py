@@ -25,53 +25,59 @@ bodyparts = [
 
 
 
-def calculate_AMAC():
+def amacScalars(loadedAngMomData):
+    # Scalar AMAC of every bodypart for one trial (newAngMom csv)
+    full_body_angmom_x = loadedAngMomData["('FullBody_AngMom', 'X')"]
+    full_body_angmom_y = loadedAngMomData["('FullBody_AngMom', 'Y')"]
+    full_body_angmom_z = loadedAngMomData["('FullBody_AngMom', 'Z')"]  
+
+    newAMACData = pandas.DataFrame()
+    
+    for bodypart in bodyparts:
+        if bodypart == "FullBody_AngMom":
+            continue
+        
+        col = (bodypart + "AMAC")
+        scalarAMACBodyPart = []
+        for time in range(len(loadedAngMomData)):
+            angmomx = loadedAngMomData["('" + bodypart + "', 'X')"].iloc[time]
+            angmomy = loadedAngMomData["('" + bodypart + "', 'Y')"].iloc[time]
+            angmomz = loadedAngMomData["('" + bodypart + "', 'Z')"].iloc[time]
+            HbodyPart = np.array([angmomx, angmomy, angmomz])
+            HfullBody = np.array([full_body_angmom_x.iloc[time], full_body_angmom_y.iloc[time], full_body_angmom_z.iloc[time]])
+            HfullBody_norm = np.linalg.norm(HfullBody, axis=0)
+            
+            scalarAMACBodyPart.append(np.vdot(HbodyPart, HfullBody) / HfullBody_norm if HfullBody_norm > 0 else 0)
+
+
+        newAMACData[col] = scalarAMACBodyPart
+    return newAMACData
+
+
+def calculate_AMAC(subjects=subjects, movements=movements):
     for subject in subjects:
         for movement in movements:
             if subject == "E2" and movement == "roundhouse":
                 continue
             rawDataPath = "newAngMom/" + subject + "/" + movement + ".csv"
             loadedAngMomData = pandas.read_csv(rawDataPath)
-            full_body_angmom_x = loadedAngMomData["('FullBody_AngMom', 'X')"]
-            full_body_angmom_y = loadedAngMomData["('FullBody_AngMom', 'Y')"]
-            full_body_angmom_z = loadedAngMomData["('FullBody_AngMom', 'Z')"]  
-
-            newAMACData = pandas.DataFrame()
-            
-            for bodypart in bodyparts:
-                if bodypart == "FullBody_AngMom":
-                    continue
-                
-                col = (bodypart + "AMAC")
-                scalarAMACBodyPart = []
-                for time in range(len(loadedAngMomData)):
-                    angmomx = loadedAngMomData["('" + bodypart + "', 'X')"].iloc[time]
-                    angmomy = loadedAngMomData["('" + bodypart + "', 'Y')"].iloc[time]
-                    angmomz = loadedAngMomData["('" + bodypart + "', 'Z')"].iloc[time]
-                    HbodyPart = np.array([angmomx, angmomy, angmomz])
-                    HfullBody = np.array([full_body_angmom_x.iloc[time], full_body_angmom_y.iloc[time], full_body_angmom_z.iloc[time]])
-                    HfullBody_norm = np.linalg.norm(HfullBody, axis=0)
-                    
-                    scalarAMACBodyPart.append(np.vdot(HbodyPart, HfullBody) / HfullBody_norm if HfullBody_norm > 0 else 0)
-
-
-                newAMACData[col] = scalarAMACBodyPart   
+            newAMACData = amacScalars(loadedAngMomData)
             
         
-            out_dir = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}"
+            out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
             os.makedirs(out_dir, exist_ok=True)
             out_path = os.path.join(out_dir, f"AMACscalar.csv")
             newAMACData.to_csv(out_path, index=False, header=True)
                         
                     
-def calculateAMACVectors():
+def calculateAMACVectors(subjects=subjects, movements=movements):
 
     for subject in subjects:
         for movement in movements:
             if subject == "E2" and movement == "roundhouse":
                 continue
             rawDataPath = "newAngMom/" + subject + "/" + movement + ".csv"
-            rawAMACpath = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}/AMACscalar.csv"
+            rawAMACpath = f"calculatedAngMomStuff/{subject}/{movement}/AMACscalar.csv"
             loadedAngMomData = pandas.read_csv(rawDataPath)
             loadedAMACData = pandas.read_csv(rawAMACpath)
 
@@ -113,20 +119,20 @@ def calculateAMACVectors():
                         elif axis == 'Z':
                             newAMACVectors[col] = AMAC_z
 
-            out_dir = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}"
+            out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
             os.makedirs(out_dir, exist_ok=True)
             out_path = os.path.join(out_dir, f"AMACVector.csv")
             newAMACVectors.to_csv(out_path, index=False, header=True)
 
 
-def calculateScalarAMOC():
+def calculateScalarAMOC(subjects=subjects, movements=movements):
 
     for subject in subjects:
         for movement in movements:
             if subject == "E2" and movement == "roundhouse":
                 continue
 
-            rawAMOCpath = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}/AMOCVector.csv"
+            rawAMOCpath = f"calculatedAngMomStuff/{subject}/{movement}/AMOCVector.csv"
             loadedAMOCData = pandas.read_csv(rawAMOCpath)
 
             newScalarAMOC = pandas.DataFrame()
@@ -142,13 +148,13 @@ def calculateScalarAMOC():
                     AMOCVector = np.array([amoc_x, amoc_y, amoc_z])
                     scalarAMOCBodyPart.append(np.linalg.norm(AMOCVector))
                 newScalarAMOC[col] = scalarAMOCBodyPart
-            out_dir = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}"
+            out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
             os.makedirs(out_dir, exist_ok=True)
             out_path = os.path.join(out_dir, f"AMOCscalar.csv")
             newScalarAMOC.to_csv(out_path, index=False, header=True)
 
             
-def calculateAMOCVectors():
+def calculateAMOCVectors(subjects=subjects, movements=movements):
     for subject in subjects:
         for movement in movements:
             if subject == "E2" and movement == "roundhouse":
@@ -156,7 +162,7 @@ def calculateAMOCVectors():
             rawDataPath = "newAngMom/" + subject + "/" + movement + ".csv"
             loadedAngMomData = pandas.read_csv(rawDataPath)
 
-            rawAMACpath = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}/AMACVector.csv"
+            rawAMACpath = f"calculatedAngMomStuff/{subject}/{movement}/AMACVector.csv"
             loadedAMACData = pandas.read_csv(rawAMACpath)
 
             newAMOCVectors = pandas.DataFrame()
@@ -187,18 +193,18 @@ def calculateAMOCVectors():
                 newAMOCVectors[col + "Y"] = AMOC_y
                 newAMOCVectors[col + "Z"] = AMOC_z
 
-            out_dir = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}"
+            out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
             os.makedirs(out_dir, exist_ok=True)
             out_path = os.path.join(out_dir, f"AMOCVector.csv")
             newAMOCVectors.to_csv(out_path, index=False, header=True)
             
-def calculateTheta(): 
+def calculateTheta(subjects=subjects, movements=movements): 
     
     for subject in subjects:
         for movement in movements:
             if subject == "E2" and movement == "roundhouse":
                 continue
-            rawAMACpath = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}/AMACVector.csv"
+            rawAMACpath = f"calculatedAngMomStuff/{subject}/{movement}/AMACVector.csv"
             loadedAMACData = pandas.read_csv(rawAMACpath)
 
             rawDataPath = "newAngMom/" + subject + "/" + movement + ".csv"
@@ -225,20 +231,23 @@ def calculateTheta():
                     thetaBodyPart.append(theta)
 
                 newThetaData[col] = thetaBodyPart
-            out_dir = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/calculatedAngMomStuff/{subject}/{movement}"
+            out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
             os.makedirs(out_dir, exist_ok=True)
             out_path = os.path.join(out_dir, f"theta.csv")
             newThetaData.to_csv(out_path, index=False, header=True)
 
-def main():
-    calculate_AMAC()
+def main(subjects=subjects, movements=movements):
+    calculate_AMAC(subjects, movements)
     print("Finished calculating AMAC scalars.")
-    calculateAMACVectors()
+    calculateAMACVectors(subjects, movements)
     print("Finished calculating AMAC vectors.")
-    calculateAMOCVectors()
+    calculateAMOCVectors(subjects, movements)
     print("Finished calculating AMOC vectors.")
-    calculateScalarAMOC()
+    calculateScalarAMOC(subjects, movements)
     print("Finished calculating AMOC scalars.")
-    calculateTheta()
+    calculateTheta(subjects, movements)
     print("Finished calculating Theta.")
-main()
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import warnings
+import pandas
+
+# Per-subject anthropometrics and segment mass model shared by every stage that needs masses
+# (changeAngMom, SegmentEnergetics). Segment masses are body mass * de Leva style mass ratios;
+# pelvis and torso split the trunk mass in the ratio 0.142 : 0.355.
+
+_TRUNK_DEN = 0.142 + 0.355
+_PELVIS_RATIO = 0.142 / _TRUNK_DEN
+_TORSO_RATIO  = 0.355 / _TRUNK_DEN
+trunk = 0.4346
+
+body_part_mass_ratios = {
+            "Head": 0.0694,
+            "Pelvis": trunk * _PELVIS_RATIO,
+            "Trunk":  trunk * _TORSO_RATIO,
+            "R_UA": 0.0271, "L_UA": 0.0271,
+            "R_FA": 0.0162, "L_FA": 0.0162,
+            "R_Hand": 0.0061, "L_Hand": 0.0061,
+            "R_Thigh": 0.1416, "L_Thigh": 0.1416,
+            "R_Shank": 0.0433, "L_Shank": 0.0433,
+            "R_Foot": 0.0137, "L_Foot": 0.0137,
+            "R_Toes": 0.0, "L_Toes": 0.0,
+            }
+
+# Body mass in kg per subject, measured values go into subjectMasses.csv (columns subject,mass)
+# in the repository root. Subjects without an entry fall back to DEFAULT_BODY_MASS with a warning.
+MASS_FILE = "subjectMasses.csv"
+DEFAULT_BODY_MASS = 75.0
+
+
+def loadBodyMasses(path=MASS_FILE):
+    if not os.path.exists(path):
+        return {}
+    table = pandas.read_csv(path)
+    return dict(zip(table["subject"].astype(str), table["mass"].astype(float)))
+
+
+def bodyMass(subject, path=MASS_FILE):
+    masses = loadBodyMasses(path)
+    if subject not in masses:
+        warnings.warn(f"No body mass for {subject} in {path}, using the {DEFAULT_BODY_MASS} kg placeholder")
+        return DEFAULT_BODY_MASS
+    return masses[subject]
+
+
+# Segment name (AngMoms_wrt_LAB prefix) -> name used in CoG_Position / CoG_Velocity
+segmentCoGNames = {
+    "L_Hand": "L_Hand_CoG",
+    "R_Hand": "R_Hand_CoG",
+    "L_FA": "L_Forearm_CoG",
+    "R_FA": "R_Forearm_CoG",
+    "L_UA": "L_UpperArm_CoG",
+    "R_UA": "R_UpperArm_CoG",
+    "Head": "Head_CoG",
+    "Trunk": "Trunk_CoG",
+    "Pelvis": "Pelvis_CoG",
+    "L_Thigh": "L_Thigh_CoG",
+    "R_Thigh": "R_Thigh_CoG",
+    "L_Shank": "L_Shank_CoG",
+    "R_Shank": "R_Shank_CoG",
+    "L_Foot": "L_Foot_CoG",
+    "R_Foot": "R_Foot_CoG",
+}
+
+
+def segmentMasses(subject):
+    # kg per segment for one subject
+    mass = bodyMass(subject)
+    return {segment: mass * ratio for segment, ratio in body_part_mass_ratios.items()}
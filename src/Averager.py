@@ -5,7 +5,9 @@ import numpy as np
 
 def average_scaled_files(directory, exclusions, output_file="averaged.csv"):
 	# Find all scaled*.csv files
-	files = [f for f in os.listdir(directory) if f.startswith("scaled") and f[-1] not in exclusions]
+	# exclusions are repetition numbers, e.g. [1] drops scaled1 (but not scaled11)
+	files = [f for f in os.listdir(directory) if f.startswith("scaled") and f[len("scaled"):].isdigit()
+		and int(f[len("scaled"):]) not in exclusions]
 	if not files:
 		raise ValueError("No scaled* files found in directory.")
 	# Read all files into DataFrames
@@ -0,0 +1,156 @@
+import os
+import numpy as np
+import pandas as pd
+import Dataloader
+import Anthropometrics
+import Prefetch
+
+# Decomposition of the segment angular momenta (about the full body CoG, see changeAngMom)
+# into a component parallel to a reference axis and the orthogonal rest.
+# With the full body H direction as axis this is exactly AMAC / AMOC; the same engine
+# also takes the lab vertical, the pelvis longitudinal axis or the kick-plane normal.
+# A trial is loaded once into arrays and every axis choice works on those arrays.
+
+bodyparts = [
+    "L_Hand", "R_Hand",
+    "L_FA", "R_FA",
+    "L_UA", "R_UA",
+    "Head", "Trunk", "Pelvis",
+    "L_Thigh", "R_Thigh",
+    "L_Shank", "R_Shank",
+    "L_Foot", "R_Foot",
+]
+axes = ["X", "Y", "Z"]
+referenceAxes = ["fullbody", "vertical", "pelvis", "kickplane"]
+
+# Kicking leg per (subject, movement). Every recorded kick is right-legged (the R_Foot CoG
+# reaches 7-13 m/s, the L_Foot stays below 1.5 m/s), add an entry here for a left kick.
+kickingSide = {}
+
+
+def kickSide(subject, movement):
+    return kickingSide.get((subject, movement), "R")
+
+
+def loadTrialArrays(subject, movement):
+    # Everything the reference axes need, as (frames, ..., 3) arrays on the same ITEM frames
+    angMomData = pd.read_csv(f"newAngMom/{subject}/{movement}.csv")
+    rawDataPath = "Raw_Data/" + subject + "/" + movement + "/"
+    cogPos, cogVel, segmentAngles = Dataloader.loadRawExports(
+        rawDataPath, ["CoG_Position.txt", "CoG_Velocity.txt", "SegmentAngles.txt"])
+    # newAngMom has one row per AngMoms_wrt_LAB frame (changeAngMom), without the ITEM column
+    if len(angMomData) != len(cogPos):
+        raise ValueError(f"newAngMom/{subject}/{movement}.csv has {len(angMomData)} rows but the raw exports "
+                         f"have {len(cogPos)} frames, rerun the angmom stage")
+    angMomData.index = cogPos.index
+
+    def vectors(data, names):
+        values = data[[(name, axis) for name in names for axis in axes]].to_numpy(dtype=float)
+        return values.reshape(len(data), len(names), 3)
+
+    return {
+        "H": angMomData[[f"('{bp}', '{axis}')" for bp in bodyparts for axis in axes]].to_numpy(dtype=float).reshape(len(angMomData), len(bodyparts), 3),
+        "H_fullbody": angMomData[[f"('FullBody_AngMom', '{axis}')" for axis in axes]].to_numpy(dtype=float),
+        "cogPos": vectors(cogPos, [Anthropometrics.segmentCoGNames[bp] + "_pos" for bp in bodyparts]),
+        "cogVel": vectors(cogVel, [Anthropometrics.segmentCoGNames[bp] + "_vel" for bp in bodyparts]),
+        "pelvisAngles": vectors(segmentAngles, ["PELVIS_ANGLE"])[:, 0],
+    }
+
+
+def pelvisLongitudinalAxis(pelvisAngles):
+    """
+    Pelvis z axis in lab coordinates from the PELVIS_ANGLE export.
+    Assumes the Visual3D default X-Y-Z Cardan sequence, R = Rx(a) Ry(b) Rz(g);
+    the longitudinal axis is the third column of R.
+    """
+    a, b = np.deg2rad(pelvisAngles[:, 0]), np.deg2rad(pelvisAngles[:, 1])
+    return np.stack([
+        np.sin(b),
+        -np.sin(a) * np.cos(b),
+        np.cos(a) * np.cos(b),
+    ], axis=1)
+
+
+def kickPlaneNormal(cogPos, cogVel, side="R"):
+    # Normal of the plane spanned by pelvis -> kicking foot and the foot velocity
+    foot = bodyparts.index(side + "_Foot")
+    pelvis = bodyparts.index("Pelvis")
+    return np.cross(cogPos[:, foot] - cogPos[:, pelvis], cogVel[:, foot])
+
+
+def referenceAxis(trial, name, side="R"):
+    frames = len(trial["H"])
+    if name == "fullbody":
+        return trial["H_fullbody"]
+    if name == "vertical":
+        return np.broadcast_to(np.array([0.0, 0.0, 1.0]), (frames, 3))
+    if name == "pelvis":
+        return pelvisLongitudinalAxis(trial["pelvisAngles"])
+    if name == "kickplane":
+        return kickPlaneNormal(trial["cogPos"], trial["cogVel"], side)
+    raise ValueError(f"Unknown reference axis {name}, expected one of {referenceAxes}")
+
+
+def decompose(H, axis):
+    """
+    Args:
+        H: (frames, segments, 3) segment angular momenta
+        axis: (frames, 3) or (frames, segments, 3) reference axis field, any length
+
+    Returns:
+        parallel (frames, segments) signed component along the axis,
+        parallelVector / orthogonalVector (frames, segments, 3),
+        angle (frames, segments) between H and the axis in rad
+    """
+    if axis.ndim == 2:
+        axis = axis[:, None, :]
+    norm = np.linalg.norm(axis, axis=-1, keepdims=True)
+    unit = np.divide(axis, norm, out=np.zeros(np.broadcast_shapes(axis.shape, norm.shape)), where=norm > 0)
+
+    parallel = np.einsum("tsi,tsi->ts", H, np.broadcast_to(unit, H.shape))
+    # no (or undefined) axis -> no parallel part, as in AMACAMOCcalculator
+    parallel = np.where(norm[..., 0] > 0, parallel, 0.0)
+    parallelVector = parallel[..., None] * unit
+    orthogonalVector = H - parallelVector
+
+    hNorm = np.linalg.norm(H, axis=-1)
+    cosine = np.divide(parallel, hNorm, out=np.zeros_like(parallel), where=hNorm > 0)
+    angle = np.arccos(np.clip(cosine, -1.0, 1.0))
+    return parallel, parallelVector, orthogonalVector, angle
+
+
+def decompositionFrame(parallel, parallelVector, orthogonalVector, angle):
+    # Column naming follows the AMAC/AMOC files: <bodypart>Par, <bodypart>ParVX, ...
+    columns = {}
+    for s, bp in enumerate(bodyparts):
+        columns[bp + "Par"] = parallel[:, s]
+        columns[bp + "Orth"] = np.linalg.norm(orthogonalVector[:, s], axis=-1)
+        columns[bp + "Angle"] = angle[:, s]
+        for idx, axis in enumerate(axes):
+            columns[bp + "ParV" + axis] = parallelVector[:, s, idx]
+            columns[bp + "OrthV" + axis] = orthogonalVector[:, s, idx]
+    return pd.DataFrame(columns)
+
+
+def computeDecompositions(trial, axisNames=referenceAxes, side="R"):
+    return {name: decompositionFrame(*decompose(trial["H"], referenceAxis(trial, name, side))) for name in axisNames}
+
+
+def saveDecompositions(subject, movement, decompositions):
+    out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
+    os.makedirs(out_dir, exist_ok=True)
+    for name, decomposition in decompositions.items():
+        decomposition.to_csv(os.path.join(out_dir, f"{name}Decomposition.csv"), index=False, header=True)
+    print(f"Axis decompositions written for {subject} {movement}")
+
+
+def main(subjects, movements, axisNames=referenceAxes, readers=Prefetch.READERS, readDepth=Prefetch.READ_DEPTH, writeDepth=Prefetch.WRITE_DEPTH):
+    trials = [(subject, movement) for subject in subjects for movement in movements
+              if os.path.exists(f"newAngMom/{subject}/{movement}.csv")]
+    Prefetch.runPipelined(
+        trials,
+        lambda trial: loadTrialArrays(*trial),
+        lambda trial, loaded: computeDecompositions(loaded, axisNames, kickSide(*trial)),
+        lambda trial, decompositions: saveDecompositions(*trial, decompositions),
+        readers, readDepth, writeDepth,
+    )
@@ -0,0 +1,159 @@
+import os
+import numpy as np
+import pandas as pd
+import TensorStore
+from concurrent.futures import ThreadPoolExecutor
+
+# Bootstrap confidence intervals for the averaged curves.
+# All resample indices are drawn up front with a fixed seed and turned into a
+# weight matrix (resample x repetition), so every bootstrap mean is a single
+# matrix product instead of a python loop over resamples.
+
+N_RESAMPLES = 2000
+SEED = 42
+
+
+def withinSubjectWeights(nRepetitions, nResamples=N_RESAMPLES, seed=SEED):
+    # weights[b, r] = how often repetition r is drawn in resample b / nRepetitions
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, nRepetitions, size=(nResamples, nRepetitions))
+    counts = np.zeros((nResamples, nRepetitions))
+    np.add.at(counts, (np.arange(nResamples)[:, None], idx), 1)
+    return counts / nRepetitions
+
+
+def hierarchicalWeights(repetitionsPerSubject, nResamples=N_RESAMPLES, seed=SEED):
+    """
+    Two-stage resampling: draw subjects with replacement, then draw repetitions
+    with replacement within every drawn subject.
+
+    Args:
+        repetitionsPerSubject: number of valid repetitions of each subject
+
+    Returns:
+        weights of shape (nResamples, nSubjects, maxRepetitions); the weights of
+        one resample sum to 1 and padded repetitions always get weight 0
+    """
+    rng = np.random.default_rng(seed)
+    nReps = np.asarray(repetitionsPerSubject)
+    nSubjects = len(nReps)
+    maxReps = nReps.max()
+
+    subjectIdx = rng.integers(0, nSubjects, size=(nResamples, nSubjects))
+    # uniform draws scaled to the repetition count of the drawn subject
+    u = rng.random(size=(nResamples, nSubjects, maxReps))
+    drawnReps = nReps[subjectIdx]
+    repIdx = np.floor(u * drawnReps[:, :, None]).astype(int)
+    # only the first n draws of a subject with n repetitions are used
+    used = np.arange(maxReps)[None, None, :] < drawnReps[:, :, None]
+
+    weights = np.zeros((nResamples, nSubjects, maxReps))
+    b = np.broadcast_to(np.arange(nResamples)[:, None, None], repIdx.shape)
+    s = np.broadcast_to(subjectIdx[:, :, None], repIdx.shape)
+    share = np.broadcast_to(1.0 / (nSubjects * drawnReps[:, :, None]), repIdx.shape)
+    np.add.at(weights, (b[used], s[used], repIdx[used]), share[used])
+    return weights
+
+
+def _percentiles(weights, flat, alpha):
+    means = weights @ flat
+    lower = np.percentile(means, 100 * alpha / 2, axis=0)
+    upper = np.percentile(means, 100 * (1 - alpha / 2), axis=0)
+    return lower, upper
+
+
+def bootstrapCI(flat, weights, alpha=0.05, workers=4):
+    """
+    Percentile confidence interval of the weighted mean.
+
+    Args:
+        flat: (nRepetitions, nChannels) data, NaN free
+        weights: (nResamples, nRepetitions) resample weights
+
+    Returns:
+        lower, upper with shape (nChannels,)
+    """
+    # numpy releases the GIL in matmul / percentile, so channel blocks run in parallel
+    blocks = np.array_split(np.arange(flat.shape[1]), max(1, min(workers, flat.shape[1])))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda cols: _percentiles(weights, flat[:, cols], alpha), blocks))
+    lower = np.concatenate([r[0] for r in results])
+    upper = np.concatenate([r[1] for r in results])
+    return lower, upper
+
+
+def withinSubjectCI(repetitions, nResamples=N_RESAMPLES, seed=SEED, alpha=0.05, workers=4):
+    # repetitions: (nRepetitions, frames, channels) -> mean, lower, upper of shape (frames, channels)
+    shape = repetitions.shape[1:]
+    flat = repetitions.reshape(repetitions.shape[0], -1)
+    weights = withinSubjectWeights(flat.shape[0], nResamples, seed)
+    lower, upper = bootstrapCI(flat, weights, alpha, workers)
+    return flat.mean(axis=0).reshape(shape), lower.reshape(shape), upper.reshape(shape)
+
+
+def hierarchicalCI(repetitions, nResamples=N_RESAMPLES, seed=SEED, alpha=0.05, workers=4):
+    """
+    Args:
+        repetitions: (subjects, maxRepetitions, frames, channels), missing repetitions NaN
+                     (e.g. one movement of a group taken from the TensorStore)
+
+    Returns:
+        mean (of subject means), lower, upper with shape (frames, channels);
+        NaN for channels without data in any repetition
+    """
+    shape = repetitions.shape[2:]
+    nSubjects, maxReps = repetitions.shape[:2]
+    flat = repetitions.reshape(nSubjects, maxReps, -1)
+
+    # channels that are NaN everywhere (holes in the store grid) don't make a repetition invalid
+    hasData = ~np.isnan(flat).all(axis=(0, 1))
+    flat = flat[:, :, hasData]
+    valid = ~np.isnan(flat).any(axis=2)
+    nReps = valid.sum(axis=1)
+    keep = nReps > 0
+    if not hasData.any() or not keep.any():
+        raise ValueError("No subject has a complete repetition, nothing to bootstrap")
+    flat, valid, nReps = flat[keep], valid[keep], nReps[keep]
+
+    # move the valid repetitions of every subject to the front so draws index into them
+    order = np.argsort(~valid, axis=1, kind="stable")
+    flat = np.take_along_axis(flat, order[:, :, None], axis=1)[:, :nReps.max()]
+    valid = np.take_along_axis(valid, order, axis=1)[:, :nReps.max()]
+    # invalid repetitions must not leak their remaining channels into the subject means
+    flat = np.where(valid[:, :, None], np.nan_to_num(flat), 0.0)
+
+    weights = hierarchicalWeights(nReps, nResamples, seed)
+    lower, upper = bootstrapCI(flat.reshape(-1, flat.shape[2]), weights.reshape(nResamples, -1), alpha, workers)
+
+    subjectMeans = flat.sum(axis=1) / nReps[:, None]
+    result = np.full((3, hasData.size), np.nan)
+    result[:, hasData] = subjectMeans.mean(axis=0), lower, upper
+    return result[0].reshape(shape), result[1].reshape(shape), result[2].reshape(shape)
+
+
+def bootstrap_scaled_files(directory, exclusions, nResamples=N_RESAMPLES, seed=SEED, alpha=0.05):
+    # Same input as Averager.average_scaled_files, writes ci_lower.csv / ci_upper.csv next to averaged.csv
+    files = [f for f in os.listdir(directory) if f.startswith("scaled") and f[len("scaled"):].isdigit()
+        and int(f[len("scaled"):]) not in exclusions]
+    if not files:
+        raise ValueError("No scaled* files found in directory.")
+    dfs = [pd.read_csv(os.path.join(directory, f)) for f in sorted(files, key=lambda f: int(f[len("scaled"):]))]
+    arr = np.stack([df.values for df in dfs], axis=0).astype(float)
+    mean, lower, upper = withinSubjectCI(arr, nResamples, seed, alpha)
+    pd.DataFrame(lower, columns=dfs[0].columns).to_csv(os.path.join(directory, "ci_lower.csv"), index=False)
+    pd.DataFrame(upper, columns=dfs[0].columns).to_csv(os.path.join(directory, "ci_upper.csv"), index=False)
+    print(f"Bootstrap CI written to {directory}")
+
+
+def groupCI(storeRoot, datatype, movement, group, nResamples=N_RESAMPLES, seed=SEED, alpha=0.05):
+    # Hierarchical subject -> repetition CI of one group (e.g. "E") straight from the TensorStore
+    tensor, labels = TensorStore.openTensorStore(storeRoot, datatype)
+    members = [s for s in labels["subject"] if s.startswith(group)]
+    data = TensorStore.select(tensor, labels, subject=members, movement=movement)
+    # (subject, repetition, frame, segment, quantity) -> (subject, repetition, frame, channel)
+    data = np.asarray(data).reshape(data.shape[:3] + (-1,))
+    mean, lower, upper = hierarchicalCI(data, nResamples, seed, alpha)
+    channelShape = (len(labels["segment"]), len(labels["quantity"]))
+    return (mean.reshape(mean.shape[:1] + channelShape),
+            lower.reshape(lower.shape[:1] + channelShape),
+            upper.reshape(upper.shape[:1] + channelShape))
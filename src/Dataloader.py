@@ -1,16 +1,67 @@
 import os
 import pandas
-import matplotlib
-import matplotlib.pyplot as plt
+import RawArchive
+
+def openRaw(filepath):
+    # The file itself if it exists, otherwise the export streamed from the
+    # Raw_Data/<subject>/<movement>.mtarc archive (see RawArchive)
+    if os.path.exists(filepath):
+        return filepath
+    archive = RawArchive.archivePath(os.path.dirname(filepath))
+    if os.path.exists(archive):
+        return RawArchive.openExport(archive, os.path.basename(filepath))
+    return filepath
+
+def exportExists(filepath):
+    # True if the raw export is on disk or packed in the trial's archive
+    if os.path.exists(filepath):
+        return True
+    archive = RawArchive.archivePath(os.path.dirname(filepath))
+    return os.path.exists(archive) and os.path.basename(filepath) in RawArchive.loadHeader(archive)["exports"]
+
+def _read(filepath, **kwargs):
+    source = openRaw(filepath)
+    try:
+        return pandas.read_csv(filepath_or_buffer = source, **kwargs)
+    finally:
+        if not isinstance(source, str):
+            source.close()
 
 def loadData(filepath):
-    loadedData = pandas.read_csv(filepath_or_buffer = filepath, sep=',', header= [0])
+    loadedData = _read(filepath, sep=',', header= [0])
     return loadedData
 
 def loadDataNoSkip(filepath):
     loadedData = pandas.read_csv(filepath_or_buffer = filepath, sep=',', header= [0,1])
     return loadedData
-    
+
+def loadRawExport(filepath):
+    # Raw Theia/Visual3D exports: tab-separated, 5 header rows (c3d path, name, type, origin, axis).
+    # Columns become (name, axis) tuples, the ITEM column is used as index.
+    # The header is parsed separately: with header=[1,4] pandas takes an empty first
+    # frame (AngMoms, CoG_Velocity, JointMoments) for an index name row and drops it.
+    header = _read(filepath, sep='\t', header=None, nrows=5, dtype=str)
+    loadedData = _read(filepath, sep='\t', header=None, skiprows=5, index_col=0)
+    loadedData.columns = pandas.MultiIndex.from_arrays([header.iloc[1, 1:].to_numpy(), header.iloc[4, 1:].to_numpy()])
+    loadedData.index.name = "ITEM"
+    return loadedData
+
+def checkAligned(exports):
+    # exports: {name: DataFrame} of one trial, all must cover the same ITEM frames
+    names = list(exports)
+    frames = exports[names[0]].index
+    for name in names[1:]:
+        if not exports[name].index.equals(frames):
+            index = exports[name].index
+            raise ValueError(f"{name} covers ITEM {index.min()}-{index.max()} ({len(index)} frames) but "
+                             f"{names[0]} covers ITEM {frames.min()}-{frames.max()} ({len(frames)} frames)")
+
+def loadRawExports(rawDataPath, names):
+    # Several raw exports of one trial, checked to line up frame by frame
+    exports = [loadRawExport(os.path.join(rawDataPath, name)) for name in names]
+    checkAligned(dict(zip(names, exports)))
+    return exports
+
 
 def load_csvs_from_dir(input_dir):
     data_dict = {}
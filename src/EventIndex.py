@@ -0,0 +1,245 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+# Persistent event index: one row per (subject, movement, repetition, event, frame),
+# stored column-wise as small integer codes in scaled_Data/eventIndex.npz and loaded once.
+# The hand-typed frame table below is the only source; the index is rebuilt
+# whenever the table changes. Phase durations, repetition counts and group
+# statistics are group-bys on the index, and Slicer.findTeepSegments reads its
+# phase boundaries from it.
+
+INDEX_PATH = "scaled_Data/eventIndex.npz"  # generated, next to the other pipeline tables
+FRAME_RATE = 120.0
+events = ["lift", "impact", "foot_down"]
+# kick phases as in the Notes, shared with Scaler's four phases and JointEnergetics.phaseWork:
+# begin -> lift, lift -> impact, impact -> foot_down, foot_down -> end
+phases = ["preparation", "execution", "impact", "recovery"]
+PRE_LIFT_FRAMES = 40      # trial begins 40 frames before lift (Slicer.calcBeginnframe)
+POST_FOOT_DOWN_FRAMES = 50  # trial ends 50 frames after foot down
+
+# Structured dataset: subject -> movement -> frame types
+# (frame numbers are row positions in the calculatedAngMomStuff files)
+
+data = {
+    "E1": {
+        "teep": {
+            "lift": [456,1082,1458,1870,2328,2723,3136,3578,4025,4469,4896],
+            "impact": [545,1133,1507,1912,2377,2769,3182,3628,4071,4515,4940],
+            "foot_down": [610,1176,1553,1956,2424,2815,3229,3674,4119,4569,5011],
+        },
+        "roundhouse": {
+            "lift": [703,1075,1542,2072,2667,3132,3642,4153,4521],
+            "impact": [734,1105,1576,2106,2700,3163,3675,4185,4548],
+            "foot_down": [806,1176,1635,2174,2753,3235,3741,4238,4604],
+        }
+    },
+
+    "E2": {
+        "teep": {
+            "lift": [340,739,1122,1496,1882,2282,2714,3151,3578,4058,4476],
+            "impact": [393,790,1167,1540,1930,2331,2766,3195,3620,4105,4524],
+            "foot_down": [446,839,1220,1603,1990,2386,2821,3258,3695,4166,4587],
+        }
+    },
+
+    "E3": {
+        "teep": {
+            "lift": [206,552,891,1249,1576,1923,2288,2660,3012,3431],
+            "impact": [240,588,929,1286,1618,1962,2325,2702,3052,3476],
+            "foot_down": [314,661,1001,1355,1690,2031,2401,2772,3176,3540],
+        },
+        "roundhouse": {
+            "lift": [477,972,1367,1723,2120,2503,2890,3279,3647,4022],
+            "impact": [510,1007,1398,1756,2157,2534,2923,3312,3678,4056],
+            "foot_down": [581,1066,1454,1828,2215,2602,2992,3375,3742,4131],
+        }
+    },
+
+    "N1": {
+        "roundhouse": {
+            "lift": [519,989,1245,1563,1855,2335,2621,2937,3230,3507],
+            "impact": [560,1024,1280,1595,1887,2369,2656,2969,3262,3540],
+            "foot_down": [760,1104,1372,1667,1959,2453,2762,3038,3331,3617],
+        }
+    },
+
+    "N2": {
+        "teep": {
+            "lift": [217,466,740,983,1247,1519,1779,2063,2411,2679],
+            "impact": [269,512,790,1028,1290,1556,1818,2100,2442,2714],
+            "foot_down": [337,591,871,1121,1403,1640,1887,2162,2516,2795],
+        },
+        "roundhouse": {
+            "lift": [259,541,871,1130,1412,1751,2065,2431,2718,2972],
+            "impact": [295,575,905,1165,1445,1789,2098,2469,2753,3009],
+            "foot_down": [395,770,1070,1200,1550,1872,2185,2566,2845,3100],
+        }
+    },
+
+    "N3": {
+        "teep": {
+            "lift": [215,489,771,1040,1349,1588,2058,2377,2966,3317],
+            "impact": [264,535,810,1080,1395,1638,2100,2423,3017,3362],
+            "foot_down": [313,575,860,1146,1446,1701,2166,2655,3083,3405],
+        },
+        "roundhouse": {
+            "lift": [235,642,922,1192,1433,1868,2111,2340,2572,2784],
+            "impact": [271,686,971,1234,1479,1909,2158,2389,2621,2837],
+            "foot_down": [533,748,1045,1309,1553,1976,2210,2455,2685,2909],
+        }
+    },
+
+    "N4": {
+        "teep": {
+            "lift": [415,754,1038,1322,1608,1892,2230,2520,2799,3300],
+            "impact": [458,795,1080,1366,1649,1935,2277,2563,2842,3345],
+            "foot_down": [504,845,1136,1424,1712,2005,2332,2621,2943,3400],
+        },
+        "roundhouse": {
+            "lift": [251,505,773,1157,1391,1628,1855,2100,2376,2616],
+            "impact": [291,541,807,1194,1430,1664,1892,2132,2416,2650],
+            "foot_down": [362,603,868,1260,1496,1726,1964,2214,2485,2720],
+        }
+    }
+}
+
+
+def _tableHash():
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def buildEventIndex(path=INDEX_PATH):
+    subjects = sorted(data)
+    movements = sorted({m for s in data.values() for m in s})
+    columns = {"subject": [], "movement": [], "repetition": [], "event": [], "frame": []}
+    for subject in subjects:
+        for movement, frameTypes in data[subject].items():
+            for event in events:
+                frames = frameTypes[event]
+                columns["subject"] += [subjects.index(subject)] * len(frames)
+                columns["movement"] += [movements.index(movement)] * len(frames)
+                columns["repetition"] += list(range(len(frames)))
+                columns["event"] += [events.index(event)] * len(frames)
+                columns["frame"] += frames
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez(
+        path,
+        subject=np.array(columns["subject"], dtype=np.int8),
+        movement=np.array(columns["movement"], dtype=np.int8),
+        repetition=np.array(columns["repetition"], dtype=np.int16),
+        event=np.array(columns["event"], dtype=np.int8),
+        frame=np.array(columns["frame"], dtype=np.int32),
+        subjectLabels=np.array(subjects),
+        movementLabels=np.array(movements),
+        eventLabels=np.array(events),
+        tableHash=np.array(_tableHash()),
+    )
+    loadEventIndex.cache_clear()
+    return path
+
+
+@lru_cache(maxsize=1)
+def loadEventIndex(path=INDEX_PATH):
+    """
+    Returns:
+        DataFrame with categorical subject/movement/event columns and integer repetition/frame
+    """
+    stale = not os.path.exists(path)
+    if not stale:
+        with np.load(path) as stored:
+            stale = str(stored["tableHash"]) != _tableHash()
+    if stale:
+        buildEventIndex(path)
+    with np.load(path) as stored:
+        return pd.DataFrame({
+            "subject": pd.Categorical.from_codes(stored["subject"], stored["subjectLabels"]),
+            "movement": pd.Categorical.from_codes(stored["movement"], stored["movementLabels"]),
+            "repetition": stored["repetition"],
+            "event": pd.Categorical.from_codes(stored["event"], stored["eventLabels"]),
+            "frame": stored["frame"],
+        })
+
+
+def eventTable(index=None):
+    # one row per repetition, one column per event
+    index = loadEventIndex() if index is None else index
+    table = index.pivot_table(index=["subject", "movement", "repetition"], columns="event", values="frame", observed=True)
+    return table[events].astype(int)
+
+
+def eventFrames(subject, movement, event, index=None):
+    # frames of one event for all repetitions, like data[subject][movement][event]
+    table = eventTable(index)
+    return table.loc[(subject, movement), event].to_numpy()
+
+
+def slicedRepetitions(table):
+    # drops the last recorded kick of every trial, Slicer needs the next begin frame to cut a repetition
+    fromEnd = table.groupby(level=["subject", "movement"], observed=True).cumcount(ascending=False)
+    return table[fromEnd.to_numpy() > 0]
+
+
+def trialSegments(subject, movement, index=None):
+    """
+    Phase boundaries of every sliced repetition relative to its begin frame,
+    [phase0_start, phase0_end, phase1_end, phase2_end, phase3_end]; the last
+    repetition is not sliced (Slicer needs the next begin frame) and left out.
+    """
+    frames = eventTable(index).loc[(subject, movement)].to_numpy()[:-1]
+    begin = frames[:, 0] - PRE_LIFT_FRAMES
+    segments = np.column_stack([
+        np.zeros(len(frames), dtype=int),
+        frames[:, 0] - begin,
+        frames[:, 1] - begin,
+        frames[:, 2] - begin,
+        frames[:, 2] + POST_FOOT_DOWN_FRAMES - begin,
+    ])
+    return segments.tolist()
+
+
+def phaseDurations(index=None, frameRate=FRAME_RATE):
+    """
+    Durations in seconds of every phase of every sliced repetition, plus single
+    support (lift -> foot_down). Preparation and recovery are the fixed windows
+    around the kick.
+    """
+    table = slicedRepetitions(eventTable(index))
+    durations = pd.DataFrame({
+        "preparation": PRE_LIFT_FRAMES,
+        "execution": table["impact"] - table["lift"],
+        "impact": table["foot_down"] - table["impact"],
+        "recovery": POST_FOOT_DOWN_FRAMES,
+        "singleSupport": table["foot_down"] - table["lift"],
+    }, index=table.index) / frameRate
+    return durations.reset_index()
+
+
+def repetitionCounts(index=None):
+    # recorded kicks and the repetitions that are sliced, scaled and averaged (one less)
+    counts = eventTable(index).groupby(level=["subject", "movement"], observed=True).size().rename("recordedKicks")
+    counts = counts.to_frame()
+    counts["repetitions"] = counts["recordedKicks"] - 1
+    return counts.reset_index()
+
+
+def durationReport(index=None, frameRate=FRAME_RATE):
+    # mean / std of every phase per subject and per group (E = expert, N = novice), sliced repetitions only
+    durations = phaseDurations(index, frameRate)
+    durations["group"] = durations["subject"].astype(str).str[0]
+    columns = phases + ["singleSupport"]
+    perSubject = durations.groupby(["subject", "movement"], observed=True)[columns].agg(["mean", "std"])
+    perGroup = durations.groupby(["group", "movement"], observed=True)[columns].agg(["mean", "std"])
+    return perSubject, perGroup
+
+
+def writeReport(outputDir="scaled_Data"):
+    os.makedirs(outputDir, exist_ok=True)
+    perSubject, perGroup = durationReport()
+    perSubject.to_csv(os.path.join(outputDir, "phaseDurations_subjects.csv"))
+    perGroup.to_csv(os.path.join(outputDir, "phaseDurations_groups.csv"))
+    repetitionCounts().to_csv(os.path.join(outputDir, "repetitionCounts.csv"), index=False)
+    print(f"Phase duration report written to {outputDir}")
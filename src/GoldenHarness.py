@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+import EventIndex
+import Scaler
+import Averager
+import changeAngMom
+import AMACAMOCcalculator
+import AxisDecomposition
+
+# Golden-output harness for faster rewrites of the thesis numbers.
+# The reference implementation (changeAngMom, AMACAMOCcalculator, Scaler, Averager)
+# is run once on a fixed subset of Raw_Data and its outputs are stored as golden arrays.
+# Any engine (a dict quantity -> function) is then compared against them per quantity
+# with its own tolerance; runtime and peak memory are recorded next to the accuracy.
+# The runtime baseline is the reference engine: other engines fail if they are slower
+# than the reference on the same quantity, or if no reference runtime is stored yet.
+#
+# Every quantity gets the golden output of the previous stage as input, so the
+# stages are checked and timed independently: angmom -> amac, angmom -> scaled -> averaged.
+#
+# The golden arrays in golden/ are committed. They are only rewritten by an explicit
+# "python src/Pipeline.py run golden --record", which belongs on the commit whose numbers
+# should be protected, never on the rewrite under test. baseline.json holds runtimes of
+# the local machine and is not committed.
+
+GOLDEN_DIR = "golden"
+TRIALS = [("E1", "teep"), ("N3", "roundhouse")]
+QUANTITIES = ["angmom", "amac", "scaled", "averaged"]
+# (rtol, atol) per quantity
+TOLERANCES = {
+    "angmom": (1e-9, 1e-9),
+    "amac": (1e-9, 1e-9),
+    "scaled": (1e-9, 1e-9),
+    "averaged": (1e-9, 1e-9),
+}
+SLACK = 0.2          # allowed slowdown relative to the baseline
+BASELINE_ENGINE = "reference"
+NOISE_FLOOR = 0.05   # seconds; differences below this never fail
+
+
+def loadInputs(subject, movement):
+    # the raw exports exactly as the angmom stage loads them
+    return {
+        "subject": subject,
+        "raw": changeAngMom.loadTrial(subject, movement),
+        "beginFrames": np.array([frame - EventIndex.PRE_LIFT_FRAMES for frame in EventIndex.eventFrames(subject, movement, "lift")]),
+        "segments": EventIndex.trialSegments(subject, movement),
+    }
+
+
+def _angMomFrame(golden):
+    # golden angmom array back into the newAngMom csv layout the AMAC code expects
+    return pd.DataFrame(golden["angmom"], columns=[str(c) for c in golden["angmom_columns"]])
+
+
+# --- reference engine --------------------------------------------------------
+
+def referenceAngMom(inputs, golden):
+    result = changeAngMom.transformAngMom(inputs["subject"], *inputs["raw"])
+    return result.to_numpy(dtype=float), np.array([str(c) for c in result.columns])
+
+
+def referenceAMAC(inputs, golden):
+    return AMACAMOCcalculator.amacScalars(_angMomFrame(golden)).to_numpy(dtype=float)
+
+
+def referenceScaled(inputs, golden):
+    data = _angMomFrame(golden)
+    begin = inputs["beginFrames"]
+    scaled = []
+    for i, segment in enumerate(inputs["segments"]):
+        sliced = data.iloc[begin[i]:begin[i + 1]].reset_index(drop=True)
+        scaled.append(Scaler.scaleDataFrameToFourPhases(sliced, segment).to_numpy(dtype=float))
+    return np.stack(scaled, axis=0)
+
+
+def referenceAveraged(inputs, golden):
+    # through the real file based Averager
+    columns = [str(c) for c in golden["angmom_columns"]]
+    with tempfile.TemporaryDirectory() as directory:
+        for i, repetition in enumerate(golden["scaled"]):
+            pd.DataFrame(repetition, columns=columns).to_csv(os.path.join(directory, "scaled" + str(i)), index=False)
+        Averager.average_scaled_files(directory, [])
+        return pd.read_csv(os.path.join(directory, "averaged.csv")).to_numpy(dtype=float)
+
+
+REFERENCE = {
+    "angmom": lambda inputs, golden: referenceAngMom(inputs, golden)[0],
+    "amac": referenceAMAC,
+    "scaled": referenceScaled,
+    "averaged": referenceAveraged,
+}
+
+
+# --- vectorized engine ---------------------------------------------------------
+
+def vectorizedAMAC(inputs, golden):
+    angmom = golden["angmom"]
+    H = angmom[:, 3:].reshape(len(angmom), -1, 3)
+    parallel = AxisDecomposition.decompose(H, angmom[:, :3])[0]
+    return parallel
+
+
+def vectorizedAveraged(inputs, golden):
+    return golden["scaled"].mean(axis=0)
+
+
+VECTORIZED = {
+    "amac": vectorizedAMAC,
+    "averaged": vectorizedAveraged,
+}
+
+ENGINES = {
+    "reference": REFERENCE,
+    "vectorized": VECTORIZED,
+}
+
+
+# --- golden storage ------------------------------------------------------------
+
+def goldenPath(subject, movement, goldenDir=GOLDEN_DIR):
+    return os.path.join(goldenDir, f"{subject}_{movement}.npz")
+
+
+def recordGolden(trials=TRIALS, goldenDir=GOLDEN_DIR):
+    # Run the reference implementation once and store its outputs
+    os.makedirs(goldenDir, exist_ok=True)
+    for subject, movement in trials:
+        inputs = loadInputs(subject, movement)
+        golden = {}
+        golden["angmom"], golden["angmom_columns"] = referenceAngMom(inputs, golden)
+        golden["amac"] = referenceAMAC(inputs, golden)
+        golden["scaled"] = referenceScaled(inputs, golden)
+        golden["averaged"] = referenceAveraged(inputs, golden)
+        np.savez_compressed(goldenPath(subject, movement, goldenDir), **golden)
+        print(f"Golden outputs recorded for {subject} {movement}")
+
+
+def loadGolden(subject, movement, goldenDir=GOLDEN_DIR):
+    with np.load(goldenPath(subject, movement, goldenDir)) as stored:
+        return dict(stored)
+
+
+def compare(result, expected, rtol, atol):
+    # vectorized over all columns; NaN must stay NaN
+    result = np.asarray(result, dtype=float)
+    if result.shape != expected.shape:
+        return {"passed": False, "reason": f"shape {result.shape} != {expected.shape}"}
+    close = np.isclose(result, expected, rtol=rtol, atol=atol, equal_nan=True)
+    diff = np.abs(result - expected)
+    return {
+        "passed": bool(close.all()),
+        "maxAbsError": float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0,
+        "mismatches": int((~close).sum()),
+    }
+
+
+def measure(function, inputs, golden, memory=False):
+    # runtime without tracing; with memory=True the peak comes from a second, traced run
+    start = time.perf_counter()
+    result = function(inputs, golden)
+    runtime = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function(inputs, golden)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, runtime, peak
+
+
+def baselinePath(goldenDir=GOLDEN_DIR):
+    return os.path.join(goldenDir, "baseline.json")
+
+
+def loadBaseline(goldenDir=GOLDEN_DIR):
+    if not os.path.exists(baselinePath(goldenDir)):
+        return {}
+    with open(baselinePath(goldenDir)) as f:
+        return json.load(f)
+
+
+def runEngine(engineName, trials=TRIALS, goldenDir=GOLDEN_DIR, updateBaseline=False, slack=SLACK, memory=False):
+    """
+    Compare one engine against the golden outputs and gate its runtime against the
+    stored runtime of the reference engine (the reference itself against its last run).
+
+    Returns:
+        list of result rows (trial, quantity, accuracy, runtime, peak memory, baseline) and
+        whether everything passed
+    """
+    engine = ENGINES[engineName]
+    baseline = loadBaseline(goldenDir)
+    referenceBaseline = baseline.setdefault(BASELINE_ENGINE, {})
+    isReference = engineName == BASELINE_ENGINE
+    rows = []
+    for subject, movement in trials:
+        inputs = loadInputs(subject, movement)
+        golden = loadGolden(subject, movement, goldenDir)
+        for quantity in QUANTITIES:
+            if quantity not in engine:
+                continue
+            key = f"{subject}/{movement}/{quantity}"
+            result, runtime, peak = measure(engine[quantity], inputs, golden, memory)
+            row = {"trial": f"{subject}/{movement}", "quantity": quantity, "runtime": runtime, "peakMemory": peak}
+            row.update(compare(result, golden[quantity], *TOLERANCES[quantity]))
+            reference = referenceBaseline.get(key)
+            row["baseline"] = reference
+            if reference is None and not isReference:
+                row["passed"] = False
+                row["reason"] = f"no {BASELINE_ENGINE} runtime stored, run the {BASELINE_ENGINE} engine first"
+            elif reference is not None and runtime > reference * (1 + slack) and runtime - reference > NOISE_FLOOR:
+                row["passed"] = False
+                row["reason"] = f"slower than {BASELINE_ENGINE} ({runtime:.3f}s > {reference:.3f}s)"
+            if isReference and (updateBaseline or reference is None):
+                referenceBaseline[key] = runtime
+            rows.append(row)
+
+    if isReference and (updateBaseline or any(r["baseline"] is None for r in rows)):
+        os.makedirs(goldenDir, exist_ok=True)
+        with open(baselinePath(goldenDir), "w") as f:
+            json.dump(baseline, f, indent=1)
+    return rows, all(r["passed"] for r in rows)
+
+
+def printReport(engineName, rows):
+    for r in rows:
+        status = "ok  " if r["passed"] else "FAIL"
+        print(f"{status} {engineName:<11} {r['trial']:<16} {r['quantity']:<9} "
+              f"err {r.get('maxAbsError', float('nan')):.2e}  {r['runtime']:.3f}s"
+              + (f"  {r['peakMemory'] / 1e6:.1f} MB" if r["peakMemory"] is not None else "")
+              + (f"  ({r['reason']})" if "reason" in r else ""))
@@ -0,0 +1,116 @@
+import os
+import numpy as np
+import pandas as pd
+import Dataloader
+import EventIndex
+import Prefetch
+
+# Joint power and work from the raw JointAngles / JointMoments exports.
+# Angular velocity is the time derivative of the joint angles (deg -> rad),
+# joint power is moment . angular velocity summed over the three axes.
+# The power curves are written next to the AMAC/AMOC results in
+# calculatedAngMomStuff/<subject>/<movement>/ so Main.py slices, scales and
+# averages them like every other datatype.
+
+FRAME_RATE = 120.0
+
+joints = [
+    "L_HIP", "R_HIP",
+    "L_KNEE", "R_KNEE",
+    "L_ANKLE", "R_ANKLE",
+    "L_SHOULDER", "R_SHOULDER",
+    "L_ELBOW", "R_ELBOW",
+]
+axes = ["X", "Y", "Z"]
+
+
+def jointArrays(loadedData, suffix):
+    # (frames, joints, 3) array of all joints in one go
+    columns = [(joint + suffix, axis) for joint in joints for axis in axes]
+    values = loadedData[columns].to_numpy(dtype=float)
+    return values.reshape(len(loadedData), len(joints), 3)
+
+
+def angularVelocity(angles, frameRate=FRAME_RATE):
+    # angles in degrees (frames, joints, 3) -> rad/s; Cardan angles wrap at +-180 deg,
+    # unwrapped first so a wrap is no velocity spike (NaN frames are left out of the unwrap)
+    radians = np.deg2rad(angles)
+    valid = ~np.isnan(radians).any(axis=(1, 2))
+    radians[valid] = np.unwrap(radians[valid], axis=0)
+    return np.gradient(radians, 1.0 / frameRate, axis=0)
+
+
+def jointPower(moments, omega):
+    # moment . angular velocity for every joint and frame -> (frames, joints)
+    return np.einsum("tji,tji->tj", moments, omega)
+
+
+def loadJointTrial(rawDataPath):
+    angleData, momentData = Dataloader.loadRawExports(rawDataPath, ["JointAngles.txt", "JointMoments.txt"])
+    return jointArrays(angleData, "_ANGLE"), jointArrays(momentData, "_MOMENT")
+
+
+def computeJointPower(angles, moments, frameRate=FRAME_RATE):
+    power = jointPower(moments, angularVelocity(angles, frameRate))
+    return pd.DataFrame(power, columns=[joint + "Power" for joint in joints])
+
+
+def calculateJointPower(rawDataPath, frameRate=FRAME_RATE):
+    return computeJointPower(*loadJointTrial(rawDataPath), frameRate)
+
+
+def phaseWork(powerData, segmentBeginFrames, segments, frameRate=FRAME_RATE):
+    """
+    Positive and negative work of every joint in every kick phase.
+
+    Args:
+        powerData: output of calculateJointPower (one row per frame of the whole trial)
+        segmentBeginFrames: Slicer.calcBeginnframe output
+        segments: Slicer.findTeepSegments output, phase boundaries relative to the begin frame
+
+    Returns:
+        DataFrame with one row per (repetition, phase) and <joint>PosWork / <joint>NegWork columns in J
+    """
+    power = np.nan_to_num(powerData.to_numpy(dtype=float))
+    dt = 1.0 / frameRate
+    # cumulative trapezoid integral of the positive / negative part, frame 0 -> 0 J
+    positive = np.clip(power, 0, None)
+    negative = np.clip(power, None, 0)
+    cumPos = np.vstack([np.zeros(power.shape[1]), np.cumsum((positive[1:] + positive[:-1]) * dt / 2, axis=0)])
+    cumNeg = np.vstack([np.zeros(power.shape[1]), np.cumsum((negative[1:] + negative[:-1]) * dt / 2, axis=0)])
+
+    # absolute frame of every phase boundary, (repetitions, 5)
+    # (Slicer produces one repetition less than there are begin frames)
+    bounds = np.asarray(segments) + np.asarray(segmentBeginFrames)[:len(segments), None]
+    bounds = np.clip(bounds, 0, len(power) - 1)
+    posWork = cumPos[bounds[:, 1:]] - cumPos[bounds[:, :-1]]
+    negWork = cumNeg[bounds[:, 1:]] - cumNeg[bounds[:, :-1]]
+
+    nReps = bounds.shape[0]
+    result = pd.DataFrame({
+        "repetition": np.repeat(np.arange(nReps), len(EventIndex.phases)),
+        "phase": np.tile(EventIndex.phases, nReps),
+    })
+    for j, joint in enumerate(joints):
+        result[joint + "PosWork"] = posWork[:, :, j].reshape(-1)
+        result[joint + "NegWork"] = negWork[:, :, j].reshape(-1)
+    return result
+
+
+def savePower(subject, movement, powerData):
+    out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
+    os.makedirs(out_dir, exist_ok=True)
+    powerData.to_csv(os.path.join(out_dir, "JointPower.csv"), index=False, header=True)
+    print(f"Joint power written for {subject} {movement}")
+
+
+def main(subjects, movements, readers=Prefetch.READERS, readDepth=Prefetch.READ_DEPTH, writeDepth=Prefetch.WRITE_DEPTH):
+    trials = [(subject, movement) for subject in subjects for movement in movements
+              if Dataloader.exportExists("Raw_Data/" + subject + "/" + movement + "/JointMoments.txt")]
+    Prefetch.runPipelined(
+        trials,
+        lambda trial: loadJointTrial("Raw_Data/" + trial[0] + "/" + trial[1] + "/"),
+        lambda trial, loaded: computeJointPower(*loaded),
+        lambda trial, powerData: savePower(*trial, powerData),
+        readers, readDepth, writeDepth,
+    )
@@ -0,0 +1,124 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Automatic detection of bad repetitions on the time-normalized (scaled) data.
+# All datatypes of a trial are stacked into one feature vector per repetition
+# (every channel z-scored so units don't matter), pairwise distances between the
+# repetitions come from one Gram matrix, and repetitions whose distance to the
+# medoid is a robust outlier (median / MAD) are suggested for exclusion.
+# The suggestions have the same format as Main.subjectmovemntExclusions.
+
+THRESHOLD = 3.5
+CACHE_DIR = "scaled_Data/outlierCache"
+
+
+def listScaledFiles(directory):
+    files = [f for f in os.listdir(directory) if f.startswith("scaled") and f[len("scaled"):].isdigit()]
+    return sorted(files, key=lambda f: int(f[len("scaled"):]))
+
+
+def _fingerprint(paths):
+    # changes whenever a scaled file is rewritten
+    h = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        h.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def repetitionFeatures(scaledResultPath):
+    """
+    Returns:
+        repetitions: repetition numbers present in every datatype
+        features: (repetitions, frames * channels) z-scored channels of all datatypes
+    """
+    datatypes = sorted(d for d in os.listdir(scaledResultPath) if os.path.isdir(os.path.join(scaledResultPath, d)))
+    perDatatype = {d: listScaledFiles(os.path.join(scaledResultPath, d)) for d in datatypes}
+    perDatatype = {d: files for d, files in perDatatype.items() if files}
+    common = sorted(set.intersection(*(set(int(f[len("scaled"):]) for f in files) for files in perDatatype.values())))
+
+    blocks = []
+    for d in perDatatype:
+        stacked = []
+        for r in common:
+            path = os.path.join(scaledResultPath, d, "scaled" + str(r))
+            stacked.append(pd.read_csv(path).to_numpy(dtype=float))
+        block = np.stack(stacked, axis=0)  # (repetitions, frames, channels)
+        mean = np.nanmean(block, axis=(0, 1), keepdims=True)
+        std = np.nanstd(block, axis=(0, 1), keepdims=True)
+        block = np.divide(block - mean, std, out=np.zeros_like(block), where=std > 0)
+        blocks.append(np.nan_to_num(block).reshape(len(common), -1))
+    return common, np.concatenate(blocks, axis=1)
+
+
+def distanceMatrix(features):
+    # RMS distance between all pairs of repetitions via the Gram matrix
+    sq = np.einsum("ij,ij->i", features, features)
+    d2 = sq[:, None] + sq[None, :] - 2 * features @ features.T
+    np.maximum(d2, 0, out=d2)
+    np.fill_diagonal(d2, 0)
+    return np.sqrt(d2 / features.shape[1])
+
+
+def cachedDistanceMatrix(scaledResultPath, cacheDir=CACHE_DIR):
+    # only the file list is needed to check the cache, the features are read on a miss
+    datatypes = sorted(d for d in os.listdir(scaledResultPath) if os.path.isdir(os.path.join(scaledResultPath, d)))
+    allPaths = [os.path.join(scaledResultPath, d, f) for d in datatypes for f in listScaledFiles(os.path.join(scaledResultPath, d))]
+    key = _fingerprint(allPaths)
+    cachePath = os.path.join(cacheDir, hashlib.sha1(os.path.abspath(scaledResultPath).encode()).hexdigest() + ".npz")
+    if os.path.exists(cachePath):
+        cached = np.load(cachePath)
+        if str(cached["key"]) == key:
+            return list(cached["repetitions"]), cached["distances"]
+
+    repetitions, features = repetitionFeatures(scaledResultPath)
+    distances = distanceMatrix(features)
+    os.makedirs(cacheDir, exist_ok=True)
+    np.savez(cachePath, key=key, repetitions=np.array(repetitions), distances=distances)
+    return repetitions, distances
+
+
+def detectOutliers(distances, threshold=THRESHOLD):
+    """
+    Args:
+        distances: (repetitions, repetitions) distance matrix
+
+    Returns:
+        medoid index, robust z-score of every repetition, boolean outlier mask
+    """
+    medoid = int(np.argmin(distances.sum(axis=1)))
+    toMedoid = distances[medoid]
+    median = np.median(toMedoid)
+    mad = np.median(np.abs(toMedoid - median))
+    if mad == 0:
+        score = np.zeros_like(toMedoid)
+    else:
+        score = 0.6745 * (toMedoid - median) / mad
+    return medoid, score, score > threshold
+
+
+def suggestExclusions(scaledResultPath, threshold=THRESHOLD, cacheDir=CACHE_DIR):
+    # repetition numbers to exclude, directly usable as Averager exclusions
+    repetitions, distances = cachedDistanceMatrix(scaledResultPath, cacheDir)
+    if len(repetitions) < 3:
+        return []
+    _, _, outliers = detectOutliers(distances, threshold)
+    return [int(r) for r, bad in zip(repetitions, outliers) if bad]
+
+
+def suggestAllExclusions(trials, scaledRoot, threshold=THRESHOLD):
+    # {(subject, movement): [repetitions]} like Main.subjectmovemntExclusions
+    suggestions = {}
+    for subject, movement in trials:
+        scaledResultPath = os.path.join(scaledRoot, subject, movement, "scaled")
+        if os.path.isdir(scaledResultPath):
+            suggestions[(subject, movement)] = suggestExclusions(scaledResultPath, threshold)
+    return suggestions
+
+
+def saveExclusions(suggestions, path):
+    with open(path, "w") as f:
+        json.dump({f"{s}/{m}": reps for (s, m), reps in suggestions.items()}, f, indent=1)
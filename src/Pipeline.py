@@ -0,0 +1,166 @@
+import argparse
+import importlib
+import os
+import sys
+
+# Single entry point for all pipeline stages, run from the repository root:
+#   python src/Pipeline.py run ingest|angmom|amac|power|energetics|axes|slice|scale|outliers|average|tensor|events|preview|golden|plot
+# Stage modules are only imported when their stage runs, so e.g. "average" never
+# pulls in matplotlib and small jobs start fast.
+
+
+def _trialStage(function, **options):
+    # slice/scale/average work per (subject, movement) from Main's trial list
+    def run(args):
+        Main = importlib.import_module("Main")
+        kwargs = {name: getattr(args, attribute) for name, attribute in options.items()}
+        for subject, movement in Main.trials(args.subject or Main.subjects, args.movement or Main.movements):
+            getattr(Main, function)(subject, movement, **kwargs)
+    return run
+
+
+def _cohortStage(module):
+    # stages with a main(subjects, movements) signature
+    def run(args):
+        Main = importlib.import_module("Main")
+        importlib.import_module(module).main(args.subject or Main.subjects, args.movement or Main.movements,
+                                              readers=args.readers, readDepth=args.read_depth, writeDepth=args.write_depth)
+    return run
+
+
+def _runAngMom(args):
+    # angmom/amac also cover elbow and uppercut, so they default to their own trial lists
+    changeAngMom = importlib.import_module("changeAngMom")
+    changeAngMom.main(args.subject or changeAngMom.subjects, args.movement or changeAngMom.movements,
+                      readers=args.readers, readDepth=args.read_depth, writeDepth=args.write_depth)
+
+
+def _runAMAC(args):
+    AMACAMOCcalculator = importlib.import_module("AMACAMOCcalculator")
+    AMACAMOCcalculator.main(args.subject or AMACAMOCcalculator.subjects, args.movement or AMACAMOCcalculator.movements)
+
+
+def _runTensor(args):
+    Main = importlib.import_module("Main")
+    TensorStore = importlib.import_module("TensorStore")
+    # the same repetitions are left out as in "average"
+    exclusions = {trial: Main.trialExclusions(*trial, args.auto_exclusions)
+                  for trial in Main.trials(args.subject or Main.subjects, args.movement or Main.movements)}
+    TensorStore.buildTensorStore(Main.scaledRoot, Main.storeRoot, args.subject or Main.subjects, args.movement or Main.movements, exclusions)
+
+
+def _runOutliers(args):
+    Main = importlib.import_module("Main")
+    OutlierDetector = importlib.import_module("OutlierDetector")
+    trials = Main.trials(args.subject or Main.subjects, args.movement or Main.movements)
+    suggestions = OutlierDetector.suggestAllExclusions(trials, Main.scaledRoot)
+    for (subject, movement), exclusions in suggestions.items():
+        print(f"    (\"{subject}\", \"{movement}\") : {exclusions},")
+    OutlierDetector.saveExclusions(suggestions, "scaled_Data/detectedExclusions.json")
+
+
+def _runIngest(args):
+    importlib.import_module("RawArchive").packAll("Raw_Data", removeRaw=args.remove_raw)
+
+
+def _runPreview(args):
+    Main = importlib.import_module("Main")
+    PreviewPlotter = importlib.import_module("PreviewPlotter")
+    os.makedirs("plots", exist_ok=True)
+    for subject, movement in Main.trials(args.subject or Main.subjects, args.movement or Main.movements):
+        PreviewPlotter.previewTrial(subject, movement, mode=args.preview_mode,
+                                    outname=os.path.join("plots", f"preview_{subject}_{movement}.png"))
+
+
+def _runEvents(args):
+    EventIndex = importlib.import_module("EventIndex")
+    EventIndex.buildEventIndex()
+    EventIndex.writeReport()
+
+
+def _runGolden(args):
+    GoldenHarness = importlib.import_module("GoldenHarness")
+    if args.record:
+        GoldenHarness.recordGolden()
+        return
+    missing = [trial for trial in GoldenHarness.TRIALS if not os.path.exists(GoldenHarness.goldenPath(*trial))]
+    if missing:
+        sys.exit(f"No golden outputs for {missing}, record them with --record on the commit to protect")
+    passed = True
+    for engine in args.engine or list(GoldenHarness.ENGINES):
+        rows, enginePassed = GoldenHarness.runEngine(engine, updateBaseline=args.update_baseline, memory=args.memory)
+        GoldenHarness.printReport(engine, rows)
+        passed = passed and enginePassed
+    if not passed:
+        sys.exit(1)
+
+
+def _runPlot(args):
+    # averaged curve (+ bootstrap CI) of one datatype per trial, as written by "average"
+    Main = importlib.import_module("Main")
+    Plotter = importlib.import_module("Plotter")
+    os.makedirs("plots", exist_ok=True)
+    for subject, movement in Main.trials(args.subject or Main.subjects, args.movement or Main.movements):
+        _, _, scaledResultPath = Main.trialPaths(subject, movement)
+        directory = os.path.join(scaledResultPath, args.datatype)
+        if not os.path.exists(os.path.join(directory, "averaged.csv")):
+            print(f"No averaged {args.datatype} for {subject} {movement}, run the average stage first")
+            continue
+        Plotter.plotAveraged(directory, title=f"{subject} {movement} {args.datatype}",
+                             outname=os.path.join("plots", f"averaged_{subject}_{movement}_{args.datatype}.png"))
+
+
+def _runAll(args):
+    importlib.import_module("Main").main()
+
+
+STAGES = {
+    "ingest": _runIngest,
+    "angmom": _runAngMom,
+    "amac": _runAMAC,
+    "power": _cohortStage("JointEnergetics"),
+    "energetics": _cohortStage("SegmentEnergetics"),
+    "axes": _cohortStage("AxisDecomposition"),
+    "slice": _trialStage("sliceTrial"),
+    "scale": _trialStage("scaleTrial"),
+    "average": _trialStage("averageTrial", autoExclusions="auto_exclusions"),
+    "outliers": _runOutliers,
+    "tensor": _runTensor,
+    "events": _runEvents,
+    "preview": _runPreview,
+    "golden": _runGolden,
+    "plot": _runPlot,
+    "all": _runAll,
+}
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="Pipeline", description="Muay Thai biomechanics pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run one pipeline stage")
+    run.add_argument("stage", choices=list(STAGES))
+    run.add_argument("--subject", action="append", help="restrict to a subject (repeatable)")
+    run.add_argument("--movement", action="append", help="restrict to a movement (repeatable)")
+    run.add_argument("--auto-exclusions", action="store_true", help="average/tensor: use the detected instead of the hand-maintained exclusions")
+    run.add_argument("--remove-raw", action="store_true", help="ingest: delete the .txt exports after a verified round trip")
+    run.add_argument("--datatype", default="AMACscalar", help="plot: scaled datatype to plot, e.g. AMACscalar or JointPower")
+    run.add_argument("--preview-mode", choices=["lttb", "minmax"], default="lttb", help="preview: decimation of the raw streams")
+    run.add_argument("--record", action="store_true", help="golden: only rerun the reference implementation and store new golden outputs")
+    run.add_argument("--engine", action="append", help="golden: engine to check (repeatable, default all)")
+    run.add_argument("--update-baseline", action="store_true", help="golden: store the reference runtimes as new baseline for all engines")
+    run.add_argument("--memory", action="store_true", help="golden: also measure peak memory (runs every quantity twice)")
+    run.add_argument("--readers", type=int, default=2, help="reader threads that prefetch trials")
+    run.add_argument("--read-depth", type=int, default=2, help="parsed trials waiting for computation")
+    run.add_argument("--write-depth", type=int, default=2, help="results waiting to be written")
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    if args.command == "run":
+        STAGES[args.stage](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,69 +6,112 @@ from mpl_toolkits.mplot3d import Axes3D  # needed for 3D plots
 import os
 import numpy as np
 
-data = Dataloader.loadDataNoSkip("processed_visual3dData/N3/roundhouse/scaled/CoG_Position/scaled5")
-dataToPlot = data["R_Foot_CoG_pos"]
+def plotCoGPosition(path="processed_visual3dData/N3/roundhouse/scaled/CoG_Position/scaled5", column="R_Foot_CoG_pos"):
+    data = Dataloader.loadDataNoSkip(path)
+    dataToPlot = data[column]
 
-# Extract X, Y, Z values
-x_values = dataToPlot.iloc[:, 0]
-y_values = dataToPlot.iloc[:, 1]
-z_values = dataToPlot.iloc[:, 2]
+    # Extract X, Y, Z values
+    x_values = dataToPlot.iloc[:, 0]
+    y_values = dataToPlot.iloc[:, 1]
+    z_values = dataToPlot.iloc[:, 2]
 
-# Create plot with 4 subplots
-fig = plt.figure(figsize=(16, 12))
+    # Create plot with 4 subplots
+    fig = plt.figure(figsize=(16, 12))
 
-# X component over time
-ax1 = fig.add_subplot(2, 2, 1)
-ax1.plot(x_values, label='X', color='red', linewidth=2)
-ax1.set_xlabel('Frame')
-ax1.set_ylabel('Position (m)')
-ax1.set_title('FullBody CoG Position - X Direction')
-ax1.grid(True)
-ax1.legend()
+    # X component over time
+    ax1 = fig.add_subplot(2, 2, 1)
+    ax1.plot(x_values, label='X', color='red', linewidth=2)
+    ax1.set_xlabel('Frame')
+    ax1.set_ylabel('Position (m)')
+    ax1.set_title('FullBody CoG Position - X Direction')
+    ax1.grid(True)
+    ax1.legend()
 
-# Y component over time
-ax2 = fig.add_subplot(2, 2, 2)
-ax2.plot(y_values, label='Y', color='green', linewidth=2)
-ax2.set_xlabel('Frame')
-ax2.set_ylabel('Position (m)')
-ax2.set_title('FullBody CoG Position - Y Direction')
-ax2.grid(True)
-ax2.legend()
+    # Y component over time
+    ax2 = fig.add_subplot(2, 2, 2)
+    ax2.plot(y_values, label='Y', color='green', linewidth=2)
+    ax2.set_xlabel('Frame')
+    ax2.set_ylabel('Position (m)')
+    ax2.set_title('FullBody CoG Position - Y Direction')
+    ax2.grid(True)
+    ax2.legend()
 
-# Z component over time
-ax3 = fig.add_subplot(2, 2, 3)
-ax3.plot(z_values, label='Z', color='blue', linewidth=2)
-ax3.set_xlabel('Frame')
-ax3.set_ylabel('Position (m)')
-ax3.set_title('FullBody CoG Position - Z Direction')
-ax3.grid(True)
-ax3.legend()
+    # Z component over time
+    ax3 = fig.add_subplot(2, 2, 3)
+    ax3.plot(z_values, label='Z', color='blue', linewidth=2)
+    ax3.set_xlabel('Frame')
+    ax3.set_ylabel('Position (m)')
+    ax3.set_title('FullBody CoG Position - Z Direction')
+    ax3.grid(True)
+    ax3.legend()
 
-# 3D trajectory plot
-ax4 = fig.add_subplot(2, 2, 4, projection='3d')
-ax4.plot(x_values, y_values, z_values, color='purple', linewidth=2)
-ax4.scatter(x_values.iloc[0], y_values.iloc[0], z_values.iloc[0], color='green', s=100, label='Start')
-ax4.scatter(x_values.iloc[-1], y_values.iloc[-1], z_values.iloc[-1], color='red', s=100, label='End')
-ax4.set_xlabel('X Position (m)')
-ax4.set_ylabel('Y Position (m)')
-ax4.set_zlabel('Z Position (m)')
-ax4.set_title('FullBody CoG Trajectory (3D)')
-ax4.legend()
-ax4.grid(True)
+    # 3D trajectory plot
+    ax4 = fig.add_subplot(2, 2, 4, projection='3d')
+    ax4.plot(x_values, y_values, z_values, color='purple', linewidth=2)
+    ax4.scatter(x_values.iloc[0], y_values.iloc[0], z_values.iloc[0], color='green', s=100, label='Start')
+    ax4.scatter(x_values.iloc[-1], y_values.iloc[-1], z_values.iloc[-1], color='red', s=100, label='End')
+    ax4.set_xlabel('X Position (m)')
+    ax4.set_ylabel('Y Position (m)')
+    ax4.set_zlabel('Z Position (m)')
+    ax4.set_title('FullBody CoG Trajectory (3D)')
+    ax4.legend()
+    ax4.grid(True)
 
-plt.tight_layout()
+    plt.tight_layout()
 
-"""# Save the plot to the plots folder
-plots_dir = "/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/plots"
-plot_filename = os.path.join(plots_dir, "rightfootN1s6scaled.png")
-print(f"Attempting to save to: {os.path.abspath(plot_filename)}", flush=True)
-print(f"Directory exists: {os.path.exists(plots_dir)}", flush=True)
-try:
-    plt.savefig(plot_filename, dpi=300, bbox_inches='tight')
-    print(f"Plot saved to {plot_filename}", flush=True)
-    print(f"File exists after save: {os.path.exists(plot_filename)}", flush=True)
-except Exception as e:
-    print(f"Error saving plot: {e}", flush=True)
-"""
-plt.show()
-plt.close()
\ No newline at end of file
+    """# Save the plot to the plots folder
+    plots_dir = "/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/plots"
+    plot_filename = os.path.join(plots_dir, "rightfootN1s6scaled.png")
+    print(f"Attempting to save to: {os.path.abspath(plot_filename)}", flush=True)
+    print(f"Directory exists: {os.path.exists(plots_dir)}", flush=True)
+    try:
+        plt.savefig(plot_filename, dpi=300, bbox_inches='tight')
+        print(f"Plot saved to {plot_filename}", flush=True)
+        print(f"File exists after save: {os.path.exists(plot_filename)}", flush=True)
+    except Exception as e:
+        print(f"Error saving plot: {e}", flush=True)
+    """
+    plt.show()
+    plt.close()
+
+
+def plotAveraged(directory, columns=None, title=None, outname=None):
+    """
+    Averaged curve of one scaled datatype directory (scaled_Data/.../scaled/<datatype>),
+    with the bootstrap CI band when ci_lower.csv / ci_upper.csv are present.
+
+    Args:
+        columns: columns to plot, defaults to all
+        outname: save the figure instead of showing it
+    """
+    averaged = pd.read_csv(os.path.join(directory, "averaged.csv"))
+    lowerPath = os.path.join(directory, "ci_lower.csv")
+    upperPath = os.path.join(directory, "ci_upper.csv")
+    hasCI = os.path.exists(lowerPath) and os.path.exists(upperPath)
+    if hasCI:
+        lower, upper = pd.read_csv(lowerPath), pd.read_csv(upperPath)
+    columns = columns or list(averaged.columns)
+
+    fig, ax = plt.subplots(figsize=(16, 8))
+    for column in columns:
+        line, = ax.plot(averaged[column], linewidth=1.5, label=column)
+        if hasCI:
+            ax.fill_between(averaged.index, lower[column], upper[column], color=line.get_color(), alpha=0.2, linewidth=0)
+    # the four kick phases are scaled to 25 frames each (Scaler)
+    for boundary in (25, 50, 75):
+        ax.axvline(boundary, color="black", linewidth=0.8, linestyle="--")
+    ax.set_xlabel("Frame (time-normalized)")
+    ax.set_title(title or directory)
+    ax.grid(True)
+    ax.legend(fontsize="small", ncol=3)
+    plt.tight_layout()
+    if outname:
+        plt.savefig(outname, dpi=150)
+        plt.close(fig)
+        print(f"Plot saved as {outname}")
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    plotCoGPosition()
@@ -0,0 +1,123 @@
+import queue
+import threading
+
+# Producer/consumer pipeline around the per-trial stages:
+#   reader threads -> bounded read queue -> compute (calling thread) -> bounded write queue -> writer thread
+# so parsing the next trials' exports and writing the previous results overlap with the
+# computation of the current trial. The bounded queues give backpressure: readers block
+# once readDepth parsed trials are waiting, so memory stays bounded on large cohorts.
+
+READERS = 2
+READ_DEPTH = 2
+WRITE_DEPTH = 2
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(q, value, stop):
+    # put that gives up once the pipeline is shutting down
+    while not stop.is_set():
+        try:
+            q.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def runPipelined(items, load, compute, write, readers=READERS, readDepth=READ_DEPTH, writeDepth=WRITE_DEPTH):
+    """
+    Run load -> compute -> write for every item with prefetching and background writing.
+
+    Args:
+        items: iterable of trial keys, e.g. (subject, movement) tuples
+        load: load(item) -> loaded data, runs on the reader threads
+        compute: compute(item, loaded) -> result, runs on the calling thread
+        write: write(item, result), runs on the writer thread
+        readers: number of reader threads
+        readDepth / writeDepth: maximum number of parsed trials / results waiting in the queues
+
+    Items are computed in the order their loads finish. The first error of any stage is
+    re-raised in the calling thread after all threads have stopped.
+    """
+    items = iter(items)
+    itemsLock = threading.Lock()
+    stop = threading.Event()
+    readQueue = queue.Queue(maxsize=max(1, readDepth))
+    writeQueue = queue.Queue(maxsize=max(1, writeDepth))
+    writeErrors = []
+
+    def reader():
+        while not stop.is_set():
+            with itemsLock:
+                item = next(items, _DONE)
+            if item is _DONE:
+                break
+            try:
+                loaded = load(item)
+            except Exception as e:
+                _put(readQueue, _Failure(e), stop)
+                return
+            if not _put(readQueue, (item, loaded), stop):
+                return
+        _put(readQueue, _DONE, stop)
+
+    def writer():
+        while True:
+            entry = writeQueue.get()
+            if entry is _DONE:
+                return
+            if writeErrors:
+                continue  # drain without writing after a failure
+            try:
+                write(*entry)
+            except Exception as e:
+                writeErrors.append(e)
+                stop.set()
+
+    readerThreads = [threading.Thread(target=reader, daemon=True) for _ in range(max(1, readers))]
+    writerThread = threading.Thread(target=writer, daemon=True)
+    for thread in readerThreads:
+        thread.start()
+    writerThread.start()
+
+    error = None
+    finished = 0
+    try:
+        while finished < len(readerThreads) and not writeErrors:
+            try:
+                entry = readQueue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if entry is _DONE:
+                finished += 1
+                continue
+            if isinstance(entry, _Failure):
+                error = entry.error
+                break
+            item, loaded = entry
+            result = compute(item, loaded)
+            del loaded
+            if not _put(writeQueue, (item, result), stop):
+                break
+    except BaseException as e:
+        error = e
+    finally:
+        if error is not None:
+            stop.set()
+        # the writer gets the sentinel even when it is full of pending results
+        writeQueue.put(_DONE)
+        writerThread.join()
+        stop.set()
+        for thread in readerThreads:
+            thread.join()
+
+    if error is not None:
+        raise error
+    if writeErrors:
+        raise writeErrors[0]
@@ -0,0 +1,135 @@
+import os
+import hashlib
+import numpy as np
+import Dataloader
+import RawArchive
+import EventIndex
+
+# Fast preview of whole raw recordings to check the hand-typed event frames.
+# Every channel is decimated to about screen resolution (largest-triangle-three-buckets
+# or a min/max envelope) before matplotlib sees it, the decimated channels are cached
+# per file, and the lift / impact / foot_down frames from the EventIndex are drawn on top.
+# The x axis is always in motion-capture frames, force plate streams are rescaled.
+
+POINTS = 2000
+CACHE_DIR = "plots/previewCache"
+REFERENCE_EXPORT = "CoG_Position.txt"
+EVENT_COLORS = {"lift": "green", "impact": "red", "foot_down": "blue"}
+
+
+def lttb(x, y, nOut):
+    """
+    Largest-triangle-three-buckets downsampling of one channel.
+
+    Returns:
+        indices of the nOut kept samples
+    """
+    n = len(y)
+    if nOut >= n or nOut < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, nOut - 1).astype(int)
+    kept = np.empty(nOut, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(nOut - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        # average point of the next bucket (the last sample for the last bucket)
+        nextStart, nextStop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avgX = x[nextStart:nextStop].mean()
+        avgY = y[nextStart:nextStop].mean()
+        area = np.abs((x[a] - avgX) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avgY - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minMaxEnvelope(y, nBuckets):
+    # (bucket centers, min, max) of equally sized buckets, vectorized via reshape
+    n = len(y)
+    size = max(1, int(np.ceil(n / nBuckets)))
+    padded = np.pad(y, (0, (-n) % size), mode="edge").reshape(-1, size)
+    centers = np.arange(padded.shape[0]) * size + size / 2
+    return centers, np.nanmin(padded, axis=1), np.nanmax(padded, axis=1)
+
+
+def _stamp(filepath):
+    # the file or the archive it is streamed from
+    if not os.path.exists(filepath):
+        filepath = RawArchive.archivePath(os.path.dirname(filepath))
+    stat = os.stat(filepath)
+    return f"{os.path.abspath(filepath)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def decimatedExport(filepath, points=POINTS, mode="lttb", cacheDir=CACHE_DIR):
+    """
+    Decimate every channel of a raw export, cached per file.
+
+    Returns:
+        dict with "columns" (name/axis labels), "samples" (number of original rows) and per
+        channel "x<i>"/"y<i>" (lttb) or "x<i>"/"lo<i>"/"hi<i>" (minmax)
+    """
+    key = hashlib.sha1(f"{_stamp(filepath)}:{os.path.basename(filepath)}:{points}:{mode}".encode()).hexdigest()
+    cachePath = os.path.join(cacheDir, key + ".npz")
+    if os.path.exists(cachePath):
+        with np.load(cachePath) as cached:
+            return dict(cached)
+
+    data = Dataloader.loadRawExport(filepath)
+    values = data.to_numpy(dtype=float)
+    x = np.arange(len(values), dtype=float)
+    result = {"columns": np.array([f"{name} {axis}" for name, axis in data.columns]), "samples": np.array(len(values))}
+    for c in range(values.shape[1]):
+        y = values[:, c]
+        valid = ~np.isnan(y)
+        if mode == "minmax":
+            centers, lo, hi = minMaxEnvelope(np.where(valid, y, np.nan), points // 2)
+            result[f"x{c}"], result[f"lo{c}"], result[f"hi{c}"] = centers, lo, hi
+        else:
+            keep = lttb(x[valid], y[valid], points)
+            result[f"x{c}"], result[f"y{c}"] = x[valid][keep], y[valid][keep]
+
+    os.makedirs(cacheDir, exist_ok=True)
+    np.savez(cachePath, **result)
+    return result
+
+
+def previewTrial(subject, movement, exports=("GRF_filtered12hz_resampled120hz.txt", "AngMoms_wrt_LAB.txt"),
+                 events=None, points=POINTS, mode="lttb", outname=None):
+    """
+    One subplot per export with all channels decimated and the event frames overlaid.
+
+    Args:
+        events: {"lift": [...], "impact": [...], "foot_down": [...]}, defaults to the EventIndex
+        outname: save the figure instead of showing it
+    """
+    import matplotlib.pyplot as plt
+
+    rawDataPath = "Raw_Data/" + subject + "/" + movement + "/"
+    if events is None:
+        table = EventIndex.eventTable()
+        events = table.loc[(subject, movement)].to_dict("list") if (subject, movement) in table.index.droplevel(2) else {}
+    frames = int(decimatedExport(os.path.join(rawDataPath, REFERENCE_EXPORT), points, mode)["samples"])
+
+    fig, axes = plt.subplots(len(exports), 1, figsize=(16, 3 * len(exports)), sharex=True, squeeze=False)
+    for ax, export in zip(axes[:, 0], exports):
+        decimated = decimatedExport(os.path.join(rawDataPath, export), points, mode)
+        # force plate streams have more samples than motion frames
+        scale = frames / int(decimated["samples"])
+        for c, label in enumerate(decimated["columns"]):
+            if mode == "minmax":
+                ax.fill_between(decimated[f"x{c}"] * scale, decimated[f"lo{c}"], decimated[f"hi{c}"], alpha=0.5, linewidth=0)
+            else:
+                ax.plot(decimated[f"x{c}"] * scale, decimated[f"y{c}"], linewidth=0.7, label=str(label))
+        for event, eventFrames in events.items():
+            for frame in eventFrames:
+                ax.axvline(frame, color=EVENT_COLORS.get(event, "black"), linewidth=0.8, alpha=0.7)
+        ax.set_title(f"{subject} {movement} {export}")
+        ax.grid(True)
+    axes[-1, 0].set_xlabel("Frame")
+    plt.tight_layout()
+    if outname:
+        plt.savefig(outname, dpi=150)
+        plt.close(fig)
+        print(f"Preview saved as {outname}")
+    else:
+        plt.show()
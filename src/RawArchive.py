@@ -0,0 +1,187 @@
+import io
+import os
+import json
+import struct
+import zlib
+from functools import lru_cache
+
+try:
+    import zstandard
+except ImportError:  # zlib from the standard library is the fallback codec
+    zstandard = None
+
+# Compressed container for the raw Theia/Visual3D exports of one subject/movement:
+#   Raw_Data/<subject>/<movement>/*.txt  ->  Raw_Data/<subject>/<movement>.mtarc
+#
+# Layout: MAGIC | uint32 header length | json header | compressed frames
+# The json header holds the codec, the c3d path (stored once instead of in every
+# header column) and per export its 5 header lines plus the (offset, length) of every
+# compressed frame of CHUNK_LINES data lines. Exports can be read one at a time and
+# are decompressed frame by frame while pandas parses them.
+
+MAGIC = b"MTARC001"
+EXTENSION = ".mtarc"
+CHUNK_LINES = 4096
+HEADER_LINES = 5
+LEVEL = 19
+
+
+def _compressor(codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=LEVEL).compress
+    return lambda data: zlib.compress(data, 9)
+
+
+def _decompressor(codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("this archive was written with zstd, install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+
+def archivePath(rawDataPath):
+    # Raw_Data/E1/teep/ -> Raw_Data/E1/teep.mtarc
+    return os.path.normpath(rawDataPath) + EXTENSION
+
+
+def pack(rawDataPath, codec=None):
+    """
+    Pack every .txt export of one subject/movement directory into one archive.
+
+    Returns:
+        path of the archive, raw size and archive size in bytes
+    """
+    codec = codec or ("zstd" if zstandard is not None else "zlib")
+    compress = _compressor(codec)
+    source = None
+    exports = {}
+    body = io.BytesIO()
+    rawSize = 0
+
+    for filename in sorted(os.listdir(rawDataPath)):
+        if not filename.endswith(".txt"):
+            continue
+        with open(os.path.join(rawDataPath, filename), "rb") as f:
+            content = f.read()
+        rawSize += len(content)
+        lines = content.splitlines(keepends=True)
+        header = [line.decode("utf-8") for line in lines[:HEADER_LINES]]
+        if source is None:
+            source = header[0].split("\t")[1].strip()
+        # the c3d path is repeated in every column of the first header line
+        header[0] = header[0].replace(source, "{source}")
+
+        frames = []
+        data = lines[HEADER_LINES:]
+        for start in range(0, len(data), CHUNK_LINES):
+            chunk = compress(b"".join(data[start:start + CHUNK_LINES]))
+            frames.append([body.tell(), len(chunk)])
+            body.write(chunk)
+        exports[filename] = {"header": header, "frames": frames, "rows": len(data)}
+
+    headerBytes = json.dumps({"codec": codec, "source": source, "exports": exports}).encode("utf-8")
+    path = archivePath(rawDataPath)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(headerBytes)))
+        f.write(headerBytes)
+        f.write(body.getvalue())
+    return path, rawSize, os.path.getsize(path)
+
+
+def readHeader(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a raw data archive")
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length).decode("utf-8"))
+    header["dataStart"] = len(MAGIC) + 4 + length
+    return header
+
+
+@lru_cache(maxsize=64)
+def _cachedHeader(path, mtime):
+    return readHeader(path)
+
+
+def loadHeader(path):
+    # header of an archive, parsed once per archive version
+    return _cachedHeader(path, os.path.getmtime(path))
+
+
+class _ExportStream(io.RawIOBase):
+    # Byte stream of one export that decompresses one frame at a time
+
+    def __init__(self, path, header, name):
+        export = header["exports"][name]
+        self._file = open(path, "rb")
+        self._start = header["dataStart"]
+        self._frames = list(export["frames"])
+        self._decompress = _decompressor(header["codec"])
+        lines = [export["header"][0].replace("{source}", header["source"])] + export["header"][1:]
+        self._buffer = "".join(lines).encode("utf-8")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self._pos >= len(self._buffer) and self._frames:
+            offset, length = self._frames.pop(0)
+            self._file.seek(self._start + offset)
+            self._buffer = self._decompress(self._file.read(length))
+            self._pos = 0
+        n = min(len(b), len(self._buffer) - self._pos)
+        b[:n] = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def openExport(path, name, header=None):
+    # Text stream of one export, e.g. openExport("Raw_Data/E1/teep.mtarc", "JointAngles.txt")
+    header = header or loadHeader(path)
+    if name not in header["exports"]:
+        raise FileNotFoundError(f"{name} not in {path}")
+    return io.TextIOWrapper(io.BufferedReader(_ExportStream(path, header, name)), encoding="utf-8", newline="")
+
+
+def unpackExport(path, name):
+    # Full text of one export, identical to the original file
+    with openExport(path, name) as f:
+        return f.read()
+
+
+def verify(rawDataPath):
+    # True if every export round-trips byte for byte
+    path = archivePath(rawDataPath)
+    header = readHeader(path)
+    for name in header["exports"]:
+        with open(os.path.join(rawDataPath, name), "r", encoding="utf-8", newline="") as f:
+            if f.read() != unpackExport(path, name):
+                return False
+    return True
+
+
+def packAll(rawRoot="Raw_Data", removeRaw=False, codec=None):
+    # Archive every Raw_Data/<subject>/<movement> directory; only removes the .txt files after a verified round trip
+    for subject in sorted(os.listdir(rawRoot)):
+        subjectPath = os.path.join(rawRoot, subject)
+        if not os.path.isdir(subjectPath):
+            continue
+        for movement in sorted(os.listdir(subjectPath)):
+            rawDataPath = os.path.join(subjectPath, movement)
+            if not os.path.isdir(rawDataPath) or not any(f.endswith(".txt") for f in os.listdir(rawDataPath)):
+                continue  # already ingested
+            path, rawSize, packedSize = pack(rawDataPath, codec)
+            print(f"{path}: {rawSize / 1e6:.1f} MB -> {packedSize / 1e6:.1f} MB")
+            if removeRaw:
+                if not verify(rawDataPath):
+                    raise ValueError(f"{path} does not reproduce {rawDataPath}, keeping the raw files")
+                for filename in os.listdir(rawDataPath):
+                    if filename.endswith(".txt"):
+                        os.remove(os.path.join(rawDataPath, filename))
@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pandas as pd
+import Dataloader
+import Anthropometrics
+import Prefetch
+
+# Translational kinetic energy and linear momentum of every segment from CoG_Velocity
+# and the shared segment mass model. All segments and frames are computed on one
+# (frames, segments, 3) array.
+
+segments = list(Anthropometrics.segmentCoGNames)
+axes = ["X", "Y", "Z"]
+
+
+def segmentVelocities(loadedCogVelData):
+    columns = [(Anthropometrics.segmentCoGNames[segment] + "_vel", axis) for segment in segments for axis in axes]
+    values = loadedCogVelData[columns].to_numpy(dtype=float)
+    return values.reshape(len(loadedCogVelData), len(segments), 3)
+
+
+def segmentEnergetics(velocities, masses):
+    """
+    Args:
+        velocities: (frames, segments, 3) CoG velocities in m/s
+        masses: (segments,) segment masses in kg
+
+    Returns:
+        kinetic energy (frames, segments) in J, linear momentum (frames, segments, 3) in kg m/s
+    """
+    momentum = masses[None, :, None] * velocities
+    kineticEnergy = 0.5 * masses[None, :] * np.einsum("tsi,tsi->ts", velocities, velocities)
+    return kineticEnergy, momentum
+
+
+def loadVelocities(rawDataPath):
+    return segmentVelocities(Dataloader.loadRawExport(os.path.join(rawDataPath, "CoG_Velocity.txt")))
+
+
+def calculateSegmentEnergetics(rawDataPath, subject):
+    return computeSegmentEnergetics(loadVelocities(rawDataPath), subject)
+
+
+def computeSegmentEnergetics(velocities, subject):
+    massTable = Anthropometrics.segmentMasses(subject)
+    masses = np.array([massTable[segment] for segment in segments])
+    kineticEnergy, momentum = segmentEnergetics(velocities, masses)
+
+    energyData = pd.DataFrame(kineticEnergy, columns=[segment + "KE" for segment in segments])
+    energyData["FullBodyKE"] = kineticEnergy.sum(axis=1)
+    momentumData = pd.DataFrame(momentum.reshape(len(momentum), -1),
+                                columns=[segment + "P" + axis for segment in segments for axis in axes])
+    for idx, axis in enumerate(axes):
+        momentumData["FullBodyP" + axis] = momentum[:, :, idx].sum(axis=1)
+    return energyData, momentumData
+
+
+def saveEnergetics(subject, movement, energyData, momentumData):
+    out_dir = f"calculatedAngMomStuff/{subject}/{movement}"
+    os.makedirs(out_dir, exist_ok=True)
+    energyData.to_csv(os.path.join(out_dir, "SegmentKineticEnergy.csv"), index=False, header=True)
+    momentumData.to_csv(os.path.join(out_dir, "SegmentMomentum.csv"), index=False, header=True)
+    print(f"Segment energetics written for {subject} {movement}")
+
+
+def main(subjects, movements, readers=Prefetch.READERS, readDepth=Prefetch.READ_DEPTH, writeDepth=Prefetch.WRITE_DEPTH):
+    trials = [(subject, movement) for subject in subjects for movement in movements
+              if Dataloader.exportExists("Raw_Data/" + subject + "/" + movement + "/CoG_Velocity.txt")]
+    Prefetch.runPipelined(
+        trials,
+        lambda trial: loadVelocities("Raw_Data/" + trial[0] + "/" + trial[1] + "/"),
+        lambda trial, velocities: computeSegmentEnergetics(velocities, trial[0]),
+        lambda trial, result: saveEnergetics(*trial, *result),
+        readers, readDepth, writeDepth,
+    )
@@ -0,0 +1,198 @@
+import os
+import ast
+import json
+import numpy as np
+import pandas as pd
+
+# Cohort-wide store of the time-normalized results written by Main.py.
+# Every datatype (AMACscalar, AMOCVector, theta, ...) becomes one memory-mapped
+# .npy file with the labeled dimensions
+#   (subject, movement, repetition, frame, segment, quantity)
+# next to a small json file holding the labels of every dimension.
+# Missing trials / repetitions are NaN, so nanmean & co. can be used directly.
+# Repetitions excluded from averaging (Main.subjectmovemntExclusions or the
+# OutlierDetector) are NaN as well and listed in the json, so the cohort means
+# agree with averaged.csv.
+
+subjects = ["E1", "E2", "E3", "N1", "N2", "N3", "N4"]
+movements = ["roundhouse", "teep"]
+segments = [
+    "FullBody_AngMom", "FullBody",
+    "L_Hand", "R_Hand",
+    "L_FA", "R_FA",
+    "L_UA", "R_UA",
+    "Head", "Trunk", "Pelvis",
+    "L_Thigh", "R_Thigh",
+    "L_Shank", "R_Shank",
+    "L_Foot", "R_Foot",
+]
+
+DIMENSIONS = ["subject", "movement", "repetition", "frame", "segment", "quantity"]
+
+
+def splitColumn(column):
+    # "L_HandAMACVX" -> ("L_Hand", "AMACVX"), "('L_Hand', 'X')" -> ("L_Hand", "X")
+    if column.startswith("("):
+        try:
+            parsed = ast.literal_eval(column)
+            return str(parsed[0]), str(parsed[1])
+        except (ValueError, SyntaxError):
+            pass
+    for segment in sorted(segments, key=len, reverse=True):
+        if column.startswith(segment):
+            return segment, column[len(segment):]
+    return column, ""
+
+
+def listScaledFiles(directory):
+    # scaled0, scaled1, ... sorted by repetition number (not alphabetically)
+    files = [f for f in os.listdir(directory) if f.startswith("scaled") and f[len("scaled"):].isdigit()]
+    return sorted(files, key=lambda f: int(f[len("scaled"):]))
+
+
+def buildTensorStore(scaledRoot, storeRoot, subjects=subjects, movements=movements, exclusions=None):
+    """
+    Collect scaledRoot/<subject>/<movement>/scaled/<datatype>/scaledN into one
+    memory-mapped tensor per datatype under storeRoot.
+
+    Args:
+        exclusions: {(subject, movement): [repetitions]} left NaN, like Main.subjectmovemntExclusions
+
+    Returns:
+        list of the datatypes that were written
+    """
+    exclusions = exclusions or {}
+    # First pass: find shapes and labels without loading any data
+    layout = {}
+    for subject in subjects:
+        for movement in movements:
+            scaledPath = os.path.join(scaledRoot, subject, movement, "scaled")
+            if not os.path.isdir(scaledPath):
+                continue
+            for datatype in sorted(os.listdir(scaledPath)):
+                directory = os.path.join(scaledPath, datatype)
+                files = listScaledFiles(directory)
+                if not files:
+                    continue
+                info = layout.setdefault(datatype, {"repetitions": 0, "frames": 0, "columns": None, "trials": []})
+                if info["columns"] is None:
+                    header = pd.read_csv(os.path.join(directory, files[0]), nrows=0)
+                    info["columns"] = list(header.columns)
+                repetitions = int(files[-1][len("scaled"):]) + 1
+                info["repetitions"] = max(info["repetitions"], repetitions)
+                info["trials"].append((subject, movement, directory, files))
+
+    os.makedirs(storeRoot, exist_ok=True)
+    for datatype, info in layout.items():
+        split = [splitColumn(c) for c in info["columns"]]
+        segmentLabels = list(dict.fromkeys(s for s, _ in split))
+        quantityLabels = list(dict.fromkeys(q for _, q in split))
+        segmentIdx = np.array([segmentLabels.index(s) for s, _ in split])
+        quantityIdx = np.array([quantityLabels.index(q) for _, q in split])
+
+        # frame count of the first repetition with data (an empty phase in Scaler gives an empty file)
+        frames = 0
+        for _, _, directory, files in info["trials"]:
+            for f in files:
+                frames = len(pd.read_csv(os.path.join(directory, f)))
+                if frames:
+                    break
+            if frames:
+                break
+
+        shape = (len(subjects), len(movements), info["repetitions"], frames, len(segmentLabels), len(quantityLabels))
+        tensor = np.lib.format.open_memmap(os.path.join(storeRoot, datatype + ".npy"), mode="w+", dtype=np.float64, shape=shape)
+        tensor[:] = np.nan
+
+        for subject, movement, directory, files in info["trials"]:
+            s = subjects.index(subject)
+            m = movements.index(movement)
+            for f in files:
+                r = int(f[len("scaled"):])
+                if r in exclusions.get((subject, movement), []):
+                    continue
+                loaded = pd.read_csv(os.path.join(directory, f))
+                if set(loaded.columns) != set(info["columns"]):
+                    print(f"Skipping {os.path.join(directory, f)}: columns differ from the other {datatype} files")
+                    continue
+                if len(loaded) != frames:
+                    print(f"Skipping {os.path.join(directory, f)}: {len(loaded)} frames instead of {frames}")
+                    continue
+                tensor[s, m, r][:, segmentIdx, quantityIdx] = loaded[info["columns"]].to_numpy(dtype=float)
+
+        tensor.flush()
+        del tensor
+
+        labels = {
+            "dimensions": DIMENSIONS,
+            "subject": list(subjects),
+            "movement": list(movements),
+            "repetition": list(range(info["repetitions"])),
+            "frame": list(range(frames)),
+            "segment": segmentLabels,
+            "quantity": quantityLabels,
+            "excluded": {f"{s}/{m}": list(reps) for (s, m), reps in exclusions.items() if reps},
+        }
+        with open(os.path.join(storeRoot, datatype + ".json"), "w") as f:
+            json.dump(labels, f, indent=1)
+        print(f"Tensor store for {datatype} written with shape {shape}")
+
+    return list(layout)
+
+
+def openTensorStore(storeRoot, datatype, mode="r"):
+    # Returns the memory-mapped tensor and its dimension labels
+    tensor = np.load(os.path.join(storeRoot, datatype + ".npy"), mmap_mode=mode)
+    with open(os.path.join(storeRoot, datatype + ".json")) as f:
+        labels = json.load(f)
+    return tensor, labels
+
+
+def select(tensor, labels, **selection):
+    """
+    Slice the tensor by label, e.g. select(t, labels, movement="teep", segment=["L_Hand", "R_Hand"]).
+    A single label drops the dimension, a list of labels keeps it.
+    """
+    index = []
+    for dim in labels["dimensions"]:
+        if dim not in selection:
+            index.append(slice(None))
+            continue
+        wanted = selection[dim]
+        if isinstance(wanted, (list, tuple)):
+            index.append([labels[dim].index(w) for w in wanted])
+        else:
+            index.append(labels[dim].index(wanted))
+    # Apply one dimension at a time so several label lists don't broadcast against each other
+    result = tensor
+    offset = 0
+    for axis, idx in enumerate(index):
+        if isinstance(idx, slice):
+            continue
+        result = np.take(result, idx, axis=axis - offset)
+        if not isinstance(idx, list):
+            offset += 1
+    return result
+
+
+def subjectMeans(tensor):
+    # Mean over repetitions -> (subject, movement, frame, segment, quantity)
+    return np.nanmean(tensor, axis=2)
+
+
+def groupMean(tensor, labels, group):
+    # Mean over the repetitions of all subjects of a group, e.g. group="E" for experts
+    # -> (movement, frame, segment, quantity)
+    members = [i for i, s in enumerate(labels["subject"]) if s.startswith(group)]
+    # (subject, movement, repetition, ...) -> (movement, subject * repetition, ...)
+    stacked = np.moveaxis(tensor[members], 1, 0)
+    stacked = stacked.reshape((stacked.shape[0], -1) + stacked.shape[3:])
+    return np.nanmean(stacked, axis=1)
+
+
+def groupContrast(tensor, labels, groupA="E", groupB="N"):
+    # Difference of the group means (of subject means), e.g. experts - novices
+    means = subjectMeans(tensor)
+    a = [i for i, s in enumerate(labels["subject"]) if s.startswith(groupA)]
+    b = [i for i, s in enumerate(labels["subject"]) if s.startswith(groupB)]
+    return np.nanmean(means[a], axis=0) - np.nanmean(means[b], axis=0)
@@ -3,100 +3,103 @@ import pandas
 import os
 from typing import List, Dict
 import numpy as np
-
-_TRUNK_DEN = 0.142 + 0.355
-_PELVIS_RATIO = 0.142 / _TRUNK_DEN
-_TORSO_RATIO  = 0.355 / _TRUNK_DEN
-weight = 75.0  
+import Anthropometrics
+import Prefetch
 
 subjects = ["E1", "E2", "E3", "N1", "N2", "N3", "N4"]
 movements = ["roundhouse", "teep","elbow","uppercut"]
-        
-trunk = 0.4346
-body_part_mass_ratios = {
-            "Head": 0.0694,
-            "Pelvis": trunk * _PELVIS_RATIO,
-            "Trunk":  trunk * _TORSO_RATIO,
-            "R_UA": 0.0271, "L_UA": 0.0271,
-            "R_FA": 0.0162, "L_FA": 0.0162,
-            "R_Hand": 0.0061, "L_Hand": 0.0061,
-            "R_Thigh": 0.1416, "L_Thigh": 0.1416,
-            "R_Shank": 0.0433, "L_Shank": 0.0433,
-            "R_Foot": 0.0137, "L_Foot": 0.0137,
-            "R_Toes": 0.0, "L_Toes": 0.0,
-            }
 
-for subject in subjects:
-    for movement in movements:
-        if subject == "E2" and movement == "roundhouse":
+
+def loadTrial(subject, movement):
+    rawDataPath = "Raw_Data/" + subject + "/" + movement + "/"
+    # the tab-separated Theia exports, checked to cover the same frames
+    return tuple(Dataloader.loadRawExports(rawDataPath, ["AngMoms_wrt_LAB.txt", "CoG_Position.txt", "CoG_Velocity.txt"]))
+
+
+def transformAngMom(subject, loadedAngMomData, loadedCogPosData, loadedCogVelData):
+    # Segment angular momenta about the full body CoG: H_G = H_segment + r x m v
+    newAngMomData = pandas.DataFrame()
+    masses = Anthropometrics.segmentMasses(subject)
+    body_parts_mapping = {
+        "FullBody_AngMom": "FullBody_CoG",
+        "L_Hand_AngMom_wrt_LAB": "L_Hand_CoG",
+        "R_Hand_AngMom_wrt_LAB": "R_Hand_CoG",
+        "L_FA_AngMom_wrt_LAB": "L_Forearm_CoG",
+        "R_FA_AngMom_wrt_LAB": "R_Forearm_CoG",
+        "L_UA_AngMom_wrt_LAB": "L_UpperArm_CoG",
+        "R_UA_AngMom_wrt_LAB": "R_UpperArm_CoG",
+        "Head_AngMom_wrt_LAB": "Head_CoG",
+        "Trunk_AngMom_wrt_LAB": "Trunk_CoG",
+        "Pelvis_AngMom_wrt_LAB": "Pelvis_CoG",
+        "L_Thigh_AngMom_wrt_LAB": "L_Thigh_CoG",
+        "R_Thigh_AngMom_wrt_LAB": "R_Thigh_CoG",
+        "L_Shank_AngMom_wrt_LAB": "L_Shank_CoG",
+        "R_Shank_AngMom_wrt_LAB": "R_Shank_CoG",
+        "L_Foot_AngMom_wrt_LAB": "L_Foot_CoG",
+        "R_Foot_AngMom_wrt_LAB": "R_Foot_CoG",
+    }
+    for bodypart in body_parts_mapping:
+        
+        if bodypart == "FullBody_AngMom":
+            newAngMomData[(bodypart, "X")] = loadedAngMomData[(bodypart, "X")]
+            newAngMomData[(bodypart, "Y")] = loadedAngMomData[(bodypart, "Y")]
+            newAngMomData[(bodypart, "Z")] = loadedAngMomData[(bodypart, "Z")]
             continue
-        rawDataPath = "Raw_Data/" + subject + "/" + movement + "/"
-        rawAngPath = os.path.join(rawDataPath,"AngMoms_wrt_LAB.txt")
-        rawCogposPath = os.path.join(rawDataPath, "CoG_Position.txt")
-        rawCogvelPath = os.path.join(rawDataPath, "CoG_Velocity.txt")
 
-        loadedCogPosData = Dataloader.loadData(rawCogposPath)
-        loadedCogVelData = Dataloader.loadData(rawCogvelPath)
-        loadedAngMomData = Dataloader.loadData(rawAngPath)
-        newAngMomData = pandas.DataFrame()
-        body_parts_mapping = {
-            "FullBody_AngMom": "FullBody_CoG",
-            "L_Hand_AngMom_wrt_LAB": "L_Hand_CoG",
-            "R_Hand_AngMom_wrt_LAB": "R_Hand_CoG",
-            "L_FA_AngMom_wrt_LAB": "L_Forearm_CoG",
-            "R_FA_AngMom_wrt_LAB": "R_Forearm_CoG",
-            "L_UA_AngMom_wrt_LAB": "L_UpperArm_CoG",
-            "R_UA_AngMom_wrt_LAB": "R_UpperArm_CoG",
-            "Head_AngMom_wrt_LAB": "Head_CoG",
-            "Trunk_AngMom_wrt_LAB": "Trunk_CoG",
-            "Pelvis_AngMom_wrt_LAB": "Pelvis_CoG",
-            "L_Thigh_AngMom_wrt_LAB": "L_Thigh_CoG",
-            "R_Thigh_AngMom_wrt_LAB": "R_Thigh_CoG",
-            "L_Shank_AngMom_wrt_LAB": "L_Shank_CoG",
-            "R_Shank_AngMom_wrt_LAB": "R_Shank_CoG",
-            "L_Foot_AngMom_wrt_LAB": "L_Foot_CoG",
-            "R_Foot_AngMom_wrt_LAB": "R_Foot_CoG",
-        }
-        for bodypart in body_parts_mapping:
-            
-            if bodypart == "FullBody_AngMom":
-                newAngMomData[(bodypart, "X")] = loadedAngMomData[(bodypart, "X")]
-                newAngMomData[(bodypart, "Y")] = loadedAngMomData[(bodypart, "Y")]
-                newAngMomData[(bodypart, "Z")] = loadedAngMomData[(bodypart, "Z")]
-                continue
+        # plain (frames, 3) arrays, row access on label-indexed Series is not positional
+        angmomSeries = loadedAngMomData[bodypart].to_numpy(dtype=float)
+        cogposSeries = loadedCogPosData[body_parts_mapping[bodypart]+ "_pos"].to_numpy(dtype=float)
+        cogvelSeries = loadedCogVelData[body_parts_mapping[bodypart]+ "_vel"].to_numpy(dtype=float)
+        fullBodyCogpos = loadedCogPosData["FullBody_CoG_pos"].to_numpy(dtype=float)
+
+        # Prepare to collect H_G values for each axis
+        H_G_x = []
+        H_G_y = []
+        H_G_z = []
+        for time in range(len(angmomSeries)):
+            I_w = angmomSeries[time]
+            r = cogposSeries[time] - fullBodyCogpos[time]
+            m = masses[bodypart.replace("_AngMom_wrt_LAB", "")]
+            v = cogvelSeries[time]
+            H_G = I_w + np.cross(r, m * v)
+            H_G_x.append(H_G[0])
+            H_G_y.append(H_G[1])
+            H_G_z.append(H_G[2])
+
+        # Add to newAngMomData with the same structure as loadedAngMomData
+        for idx, axis in enumerate(['X', 'Y', 'Z']):
+            col = (bodypart.replace("_AngMom_wrt_LAB", ""), axis)
+            if col not in newAngMomData.columns:
+                newAngMomData[col] = np.nan
+            if axis == 'X':
+                newAngMomData[col] = H_G_x
+            elif axis == 'Y':
+                newAngMomData[col] = H_G_y
+            elif axis == 'Z':
+                newAngMomData[col] = H_G_z
+    return newAngMomData
+
+
+def saveAngMom(subject, movement, newAngMomData):
+    # Save with the same multi-header structure as the raw data
+    out_dir = f"newAngMom/{subject}"
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, f"{movement}.csv")
+    newAngMomData.to_csv(out_path, index=False, header=True)
 
-            angmomSeries = loadedAngMomData[bodypart]
-            cogposSeries = loadedCogPosData[body_parts_mapping[bodypart]+ "_pos"]
-            cogvelSeries = loadedCogVelData[body_parts_mapping[bodypart]+ "_vel"]
 
-            # Prepare to collect H_G values for each axis
-            H_G_x = []
-            H_G_y = []
-            H_G_z = []
-            for time in range(len(angmomSeries)):
-                I_w = angmomSeries.iloc[time]
-                r = cogposSeries.iloc[time] - loadedCogPosData["FullBody_CoG_pos"].iloc[time]
-                m = weight * body_part_mass_ratios[bodypart.replace("_AngMom_wrt_LAB", "")]
-                v = cogvelSeries.iloc[time]
-                H_G = I_w + np.cross(r, v)
-                H_G_x.append(H_G[0])
-                H_G_y.append(H_G[1])
-                H_G_z.append(H_G[2])
+def main(subjects=subjects, movements=movements, readers=Prefetch.READERS, readDepth=Prefetch.READ_DEPTH, writeDepth=Prefetch.WRITE_DEPTH):
+    # parsing the next trials and writing the last result overlap with the transform
+    trials = [(subject, movement) for subject in subjects for movement in movements
+              if not (subject == "E2" and movement == "roundhouse")]
+    Prefetch.runPipelined(
+        trials,
+        lambda trial: loadTrial(*trial),
+        lambda trial, loaded: transformAngMom(trial[0], *loaded),
+        lambda trial, newAngMomData: saveAngMom(*trial, newAngMomData),
+        readers, readDepth, writeDepth,
+    )
 
-            # Add to newAngMomData with the same structure as loadedAngMomData
-            for idx, axis in enumerate(['X', 'Y', 'Z']):
-                col = (bodypart.replace("_AngMom_wrt_LAB", ""), axis)
-                if col not in newAngMomData.columns:
-                    newAngMomData[col] = np.nan
-                if axis == 'X':
-                    newAngMomData[col] = H_G_x
-                elif axis == 'Y':
-                    newAngMomData[col] = H_G_y
-                elif axis == 'Z':
-                    newAngMomData[col] = H_G_z
 
-        # Save with the same multi-header structure as the raw data
-        out_dir = f"/home/paul/Schreibtisch/Bachelorarbeit/Bachelor_Muay_Thai/newAngMom/{subject}"
-        os.makedirs(out_dir, exist_ok=True)
-        out_path = os.path.join(out_dir, f"{movement}.csv")
-        newAngMomData.to_csv(out_path, index=False, header=True)
\ No newline at end of file
+if __name__ == "__main__":
+    main()